@@ -0,0 +1,191 @@
+"""
+Cluster launcher and supervisor for the Listener Discord bot.
+
+A single `AutoShardedBot` runs every shard on one event loop in one process.
+The launcher instead splits the shard range into `cluster_count` contiguous
+blocks and runs one `main.py` process per block, each with its own `CoreClient`
+limited to its `shard_ids`. It handles the following:
+
+- Working out the shard count, either from `shard_count` in the config or from
+  the count Discord recommends for the bot token
+- Starting the clusters one after another, so their shards do not all identify
+  at once
+- Restarting a cluster that crashed, with a growing delay if it keeps crashing.
+  A cluster that exits cleanly (for example after `/shutdown`) stays down
+- Running the IPC server that collects each cluster's counters (see
+  `listener.core.cluster`)
+- Stopping every cluster on SIGINT/SIGTERM
+
+Run it with `python src/launcher.py` from the repository root, the same way as
+`main.py`.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from os.path import abspath, dirname
+from typing import List, NoReturn, Optional
+
+import aiohttp
+from dotenv import load_dotenv
+
+from listener.core.cluster import ClusterInfo, IPCServer, split_shards
+
+MAIN = dirname(abspath(__file__)) + "/main.py"
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+
+# A cluster that stayed up this long is considered healthy again.
+STABLE_AFTER = 600.0
+# Discord allows one identify every five seconds per bot by default.
+IDENTIFY_INTERVAL = 5.0
+
+
+def load_config() -> dict:
+    with open(dirname(abspath(__file__)) + "/data/config.json", "r") as f:
+        return json.load(f)
+
+
+async def recommended_shards(token: str) -> int:
+    """Asks Discord how many shards the bot should run."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            GATEWAY_URL, headers={"Authorization": f"Bot {token}"}
+        ) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+
+class Cluster:
+    """One bot process and its restart bookkeeping."""
+
+    def __init__(self, info: ClusterInfo, start_delay: float = 0.0) -> None:
+        self.info = info
+        self.start_delay = start_delay
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started = 0.0
+        self.restarts = 0
+
+    async def spawn(self) -> NoReturn:
+        env = dict(os.environ)
+        env.update(self.info.to_env())
+        self.process = await asyncio.create_subprocess_exec(sys.executable, MAIN, env=env)
+        self.started = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+
+class Supervisor:
+    """Starts the clusters and restarts the ones that crash."""
+
+    def __init__(
+        self,
+        clusters: List[Cluster],
+        ipc: IPCServer,
+        restart_delay: float = 5.0,
+        max_restart_delay: float = 300.0,
+    ) -> None:
+        self.clusters = clusters
+        self.ipc = ipc
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self._stopping = False
+
+    async def _supervise(self, cluster: Cluster) -> NoReturn:
+        info = cluster.info
+        await asyncio.sleep(cluster.start_delay)
+        delay = self.restart_delay
+        while not self._stopping:
+            await cluster.spawn()
+            print(
+                f"[LAUNCHER] Cluster {info.cluster_id} started with shards "
+                f"{info.shard_ids or 'auto'} (pid {cluster.process.pid})"
+            )
+            code = await cluster.process.wait()
+            self.ipc.forget(info.cluster_id)
+            if self._stopping:
+                break
+            if code == 0:
+                print(f"[LAUNCHER] Cluster {info.cluster_id} shut down, not restarting")
+                break
+
+            if time.monotonic() - cluster.started >= STABLE_AFTER:
+                delay = self.restart_delay
+            cluster.restarts += 1
+            print(
+                f"[LAUNCHER] Cluster {info.cluster_id} exited with code {code}, "
+                f"restarting in {delay:.0f}s (restart #{cluster.restarts})"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_restart_delay)
+
+    async def run(self) -> NoReturn:
+        await self.ipc.start()
+        try:
+            await asyncio.gather(*(self._supervise(c) for c in self.clusters))
+        finally:
+            await self.ipc.close()
+
+    async def stop(self, timeout: float = 30.0) -> NoReturn:
+        """Asks every cluster to exit, killing the ones that do not in time."""
+        self._stopping = True
+        running = [c for c in self.clusters if c.running]
+        for cluster in running:
+            cluster.process.terminate()
+        for cluster in running:
+            try:
+                await asyncio.wait_for(cluster.process.wait(), timeout)
+            except asyncio.TimeoutError:
+                print(f"[LAUNCHER] Cluster {cluster.info.cluster_id} did not stop, killing it")
+                cluster.process.kill()
+                await cluster.process.wait()
+
+
+async def main() -> NoReturn:
+    load_dotenv()
+    config = load_config()
+    cluster_count = int(config.get("cluster_count", 1))
+    shard_count = config.get("shard_count")
+    ipc_port = int(config.get("ipc_port", 4210))
+
+    if shard_count is None and cluster_count > 1:
+        shard_count = await recommended_shards(os.getenv("BOT_TOKEN"))
+        print(f"[LAUNCHER] Discord recommends {shard_count} shards")
+
+    clusters = []
+    if shard_count is None:
+        # One cluster without a fixed shard count lets the bot shard itself.
+        clusters.append(Cluster(ClusterInfo(ipc_port=ipc_port)))
+    else:
+        cluster_count = max(1, min(cluster_count, shard_count))
+        identified = 0
+        for cluster_id, shard_ids in enumerate(split_shards(shard_count, cluster_count)):
+            info = ClusterInfo(cluster_id, cluster_count, shard_ids, shard_count, ipc_port)
+            clusters.append(Cluster(info, start_delay=identified * IDENTIFY_INTERVAL))
+            identified += len(shard_ids)
+
+    print(f"[LAUNCHER] Starting {len(clusters)} cluster(s) for {shard_count or 'auto'} shards")
+    supervisor = Supervisor(
+        clusters,
+        IPCServer(ipc_port),
+        restart_delay=float(config.get("cluster_restart_delay", 5)),
+    )
+
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, lambda: loop.create_task(supervisor.stop()))
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers.
+            pass
+
+    await supervisor.run()
+    print("[LAUNCHER] All clusters stopped")
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main())
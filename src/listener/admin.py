@@ -13,6 +13,7 @@ import asyncio
 import datetime
 import json
 import os
+import time
 import typing
 from os import system as sys
 from os.path import abspath, dirname
@@ -26,7 +27,8 @@ from disnake.ext.commands.params import Param
 from disnake.ui import Button, Select, View
 from dotenv import load_dotenv
 
-from listener.utils import Config, Logger, Settings, Strings, Utils
+from listener.core.events import events as event_log
+from listener.utils import Config, Logger, Utils
 
 # from disnake_components import Button, ButtonStyle, disnakeComponents
 
@@ -59,9 +61,7 @@ class Confirm(disnake.ui.View):
     async def confirm(
         self, button: disnake.ui.Button, interaction: disnake.MessageInteraction
     ):
-        s = await Settings(self.ctx.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = self.ctx.strings
         if isinstance(self.ctx, disnake.ApplicationCommandInteraction):
             author = self.ctx.author
         else:
@@ -86,7 +86,9 @@ class Confirm(disnake.ui.View):
             print("---------------------------")
             print("[SHUTDOWN] Shutdown requested by bot owner")
             print("---------------------------")
-            await self.bot.close()
+            # Not awaited: shutdown() closes the client this button callback
+            # runs on, so the callback must not wait for it to finish.
+            asyncio.ensure_future(self.bot.shutdown.shutdown())
         else:
             await interaction.response.edit_message(
                 embed=disnake.Embed(
@@ -104,9 +106,7 @@ class Confirm(disnake.ui.View):
     async def cancel(
         self, button: disnake.ui.Button, interaction: disnake.MessageInteraction
     ):
-        s = await Settings(self.ctx.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = self.ctx.strings
         if isinstance(self.ctx, disnake.ApplicationCommandInteraction):
             author = self.ctx.author
         else:
@@ -130,6 +130,116 @@ class Admin(commands.Cog, name="Admin"):
         self.bot = bot
         self.name = "Admin"
 
+    @commands.slash_command(
+        name="events",
+        description="Search the structured event log [OWNERS-ONLY].",
+    )
+    @commands.is_owner()
+    async def slashevents(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        kind: str = Param(None, description="Event kind, e.g. command or error."),
+        guild_id: str = Param(None, description="Guild ID."),
+        user_id: str = Param(None, description="User ID."),
+        command: str = Param(None, description="Command name."),
+        hours: float = Param(24, description="How many hours back to search."),
+        limit: int = Param(10, description="Maximum number of events.", ge=1, le=25),
+    ) -> NoReturn:
+        """Shows the newest events matching the given filters.
+
+        Attributes:
+        -----------
+        - `kind`, `guild_id`, `user_id`, `command` - optional filters
+        - `hours` - how far back to search
+        - `limit` - how many events to show
+
+        """
+        await inter.response.defer(ephemeral=True)
+        found = await event_log.query(
+            since=time.time() - hours * 3600,
+            limit=limit,
+            kind=kind,
+            guild_id=guild_id,
+            user_id=user_id,
+            command=command,
+        )
+
+        embed = disnake.Embed(title=f"Events ({len(found)})", color=0x0C0C0C)
+        for event in found:
+            stamp = datetime.datetime.fromtimestamp(event["ts"]).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            details = [f"guild: {event['guild_id']}", f"user: {event['user_id']}"]
+            if event["command"]:
+                details.append(f"command: {event['command']}")
+            details.extend(f"{key}: {value}" for key, value in event["data"].items())
+            embed.add_field(
+                name=f"{stamp} · {event['kind']}",
+                value=f"```{chr(10).join(details)[:1000]}```",
+                inline=False,
+            )
+        if not found:
+            embed.description = "No events match these filters."
+        await inter.edit_original_message(embed=embed)
+
+    @commands.slash_command(
+        name="cogusage",
+        description="Show which modules were used since boot [OWNERS-ONLY].",
+    )
+    @commands.is_owner()
+    async def slashcogusage(self, inter: disnake.ApplicationCommandInteraction) -> NoReturn:
+        """Shows command uses per module since boot, and the modules nobody used."""
+        report = self.bot.lazy.usage_report()
+        embed = disnake.Embed(title="Module usage since boot", color=0x0C0C0C)
+        used = "\n".join(
+            f"{name}: {count}"
+            for name, count in sorted(report["used"].items(), key=lambda item: -item[1])
+        )
+        embed.add_field(name="Used", value=f"```{used or '-'}```"[:1024], inline=False)
+        embed.add_field(
+            name="Loaded, never used",
+            value=f"```{', '.join(report['unused']) or '-'}```"[:1024],
+            inline=False,
+        )
+        embed.add_field(
+            name="Lazy, never loaded",
+            value=f"```{', '.join(report['never_loaded']) or '-'}```"[:1024],
+            inline=False,
+        )
+        await inter.response.send_message(embed=embed, ephemeral=True)
+
+    @commands.slash_command(
+        name="synccommands",
+        description="Sync the changed application commands [OWNERS-ONLY].",
+    )
+    @commands.is_owner()
+    async def slashsynccommands(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        force: bool = Param(False, description="Compare every command with Discord."),
+    ) -> NoReturn:
+        """Pushes the application commands that changed since the last sync.
+
+        Attributes:
+        -----------
+        - `force` - ignore the stored hashes and compare with Discord's copy
+
+        """
+        await inter.response.defer(ephemeral=True)
+        try:
+            counts = await self.bot.command_sync.sync(force=force)
+        except Exception as e:
+            embed = Utils.error_embed(f"`{type(e).__name__}`: {e}")
+            return await inter.edit_original_message(embed=embed)
+        if counts is None:
+            description = "Nothing changed since the last sync."
+        else:
+            description = ", ".join(f"{count} {action}" for action, count in counts.items())
+        embed = disnake.Embed(
+            title="Application commands", description=description, color=0x0C0C0C
+        )
+        await inter.edit_original_message(embed=embed)
+
     # ... [rest of the code remains unchanged]
     @commands.command(slash_command=True, message_command=True)
     @commands.is_owner()
@@ -368,9 +478,7 @@ class Admin(commands.Cog, name="Admin"):
         inter: disnake.ApplicationCommandInteraction,
         sts: str = Param(description="Text of status."),
     ):
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
         author = inter.author
 
         if str(author.id) in valid_users:
@@ -398,16 +506,15 @@ class Admin(commands.Cog, name="Admin"):
     @commands.command(description="Bot restart")
     @commands.is_owner()
     async def restart(self, ctx):
-        for ext in self.bot.cogs:  # Idk how you called it
-            self.bot.reload_extension(f"{ext}")
+        # Cog names are not extension names, reload the loaded extensions themselves.
+        for ext in list(self.bot.extensions):
+            self.bot.reload_extension(ext)
 
     @commands.command(
         slash_command=True, message_command=True, description="Bot invite links"
     )
     async def invite(self, ctx: Context):
-        s = await Settings(ctx.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = ctx.strings
         view = disnake.ui.View()
         viewx = disnake.ui.View()
         view.add_item(
@@ -475,9 +582,7 @@ class Admin(commands.Cog, name="Admin"):
         description="Bot invite links.",
     )
     async def slashinvite(self, inter: disnake.ApplicationCommandInteraction):
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
         view = disnake.ui.View()
         viewx = disnake.ui.View()
         view.add_item(
@@ -578,9 +683,7 @@ class Admin(commands.Cog, name="Admin"):
         description="Bot restart/shutdown",
     )
     async def shutdown(self, ctx: Context):  # Команда для выключения бота
-        s = await Settings(ctx.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = ctx.strings
         author = ctx.message.author
         viewb = Confirm(ctx, self.bot)
         viewbx = disnake.ui.View()
@@ -600,9 +703,7 @@ class Admin(commands.Cog, name="Admin"):
     async def slashshutdown(
         self, inter: disnake.ApplicationCommandInteraction
     ):  # Команда для выключения бота
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
         author = inter.author
         viewb = Confirm(inter, self.bot)
         viewbx = disnake.ui.View()
@@ -619,9 +720,7 @@ class Admin(commands.Cog, name="Admin"):
         slash_command=True, message_command=True, description="Set bot status"
     )
     async def set_status(self, ctx, *args):
-        s = await Settings(ctx.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = ctx.strings
         author = ctx.message.author
         if str(author.id) in valid_users:
             await self.bot.change_presence(activity=disnake.Game(" ".join(args)))
@@ -1,5 +1,4 @@
 import asyncio
-import datetime
 import os
 import platform
 
@@ -8,7 +7,9 @@ import psutil
 from disnake.ext import commands
 from disnake.ext.commands import Bot
 
-from listener.utils import Config, Logger, Settings, Strings
+from listener.core.logsink import sink as log_sink
+from listener.core.loop import describe as describe_loop
+from listener.utils import Config, Logger
 
 CONFIG = Config()
 
@@ -18,7 +19,6 @@ class Broadcast(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.logpath = "logs/log.txt"
 
     @commands.slash_command(
         name="announce",
@@ -39,10 +39,7 @@ class Broadcast(commands.Cog):
             The content of the announcement.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            prefix = await s.get_field("prefix", CONFIG["default_prefix"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             announcement = disnake.Embed(
                 title=STRINGS["general"]["announcestitle"],
                 description=STRINGS["general"]["announcesdesc"],
@@ -111,22 +108,30 @@ class Broadcast(commands.Cog):
             The interaction object.
         """
         try:
-            voice_states = inter.bot.voice_clients
-            guilds = inter.bot.guilds
-            total_members = sum(guild.member_count for guild in guilds)
+            stats = await inter.bot.stats.get()
 
             debug_info = [
-                f"```Voice channels: {len(voice_states)} ```",
-                f"```Servers: {len(guilds)} ```",
-                f"```Total members: {total_members} ```",
+                f"```Voice channels: {stats.voice_clients} ```",
+                f"```Servers: {stats.guilds} ```",
+                f"```Total members: {stats.users} ```",
+                f"```Shards: {stats.shards} in {stats.clusters} cluster(s) ```",
                 f"```Latency: {round(inter.bot.latency * 1000)}ms ```",
+                f"```Music players: {stats.music_players} ```",
                 f"```Disnake.py version: {disnake.__version__} ```",
                 f"```Python version: {platform.python_version()} ```",
+                f"```Event loop: {describe_loop()} ```",
                 f"```Operating system: {platform.system()} {platform.release()} ```",
                 f"```CPU usage: {psutil.cpu_percent()}% ```",
                 f"```Memory usage: {psutil.virtual_memory().percent}% ```",
             ]
 
+            if music := inter.bot.get_cog("Music"):
+                reaper = music.reaper.info()
+                debug_info.append(
+                    f"```Players reaped: {reaper['reaped']}, "
+                    f"~{reaper['reclaimed_bytes'] // 1024} KiB freed ```"
+                )
+
             # Add bot permissions
             bot_permissions = inter.guild.me.guild_permissions
             permission_info = ["Bot Permissions:"]
@@ -171,9 +176,7 @@ class Broadcast(commands.Cog):
 
             # Print command info to console and save to log
             print("\n".join(command_info))
-            with open(self.logpath, "a", encoding="utf-8") as file:
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                file.write(f"[{timestamp}] {("\n".join(command_info))}\n")
+            log_sink.write("\n".join(command_info))
 
 
             
@@ -0,0 +1,264 @@
+"""
+Startup profiling, dependency prefetching and the requirements preflight.
+
+`BootProfiler` records how long each boot phase of `main.py` takes and, for
+every extension, how long its dependencies took to import and how long
+`load_extension` (module body and `setup`) took afterwards. The report is
+printed and written to `logs/startup.json` once the bot is ready, so the
+time to the gateway's READY is included.
+
+`prefetch` imports the third-party modules the extensions depend on from a
+thread pool before the extensions are loaded. The extensions themselves still
+load one by one on the event loop, because their `setup` registers cogs on the
+bot; only plain module imports, which are thread-safe and spend much of their
+time on disk reads and native initialization, run concurrently. Dependencies
+are found by parsing each extension's top-level imports, so nothing is imported
+that the extension would not have imported anyway.
+
+`check_requirements` replaces the `pip install` calls `main.py` used to run on
+every boot: it only compares `requirements.txt` against the installed
+distributions and prints what is missing, without touching the network.
+`source_mismatches` also catches requirements pinned to a git URL (the disnake
+fork of jishaku, the wavelink fork the music cog needs) that are installed
+from somewhere else, usually PyPI under the same name.
+"""
+
+import ast
+import importlib
+import importlib.util
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NoReturn, Optional, Tuple
+
+# Packages of the bot itself. Importing them runs bot code, so they are left to
+# the extension loader.
+LOCAL_PACKAGES = {"listener"}
+
+# Distributions the bot must not run next to.
+CONFLICTS = ("discord.py",)
+
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+REQUIREMENT_URL = re.compile(r"@\s*(\S+)")
+
+
+class BootProfiler:
+    """Collects phase and per-extension timings of one boot."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.extensions: Dict[str, Dict[str, float]] = {}
+        self.failed: Dict[str, str] = {}
+        self._open: Dict[str, float] = {}
+        self.path = Path("logs/startup.json")
+        self.finished = False
+
+    def begin(self, name: str) -> NoReturn:
+        self._open[name] = time.perf_counter()
+
+    def end(self, name: str) -> NoReturn:
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.phases[name] = time.perf_counter() - started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def record(self, extension: str, **timings: float) -> NoReturn:
+        self.extensions.setdefault(extension, {}).update(timings)
+
+    def fail(self, extension: str, error: str) -> NoReturn:
+        self.failed[extension] = error
+
+    def as_dict(self) -> Dict:
+        return {
+            "total": time.perf_counter() - self.started,
+            "phases": self.phases,
+            "extensions": self.extensions,
+            "failed": self.failed,
+        }
+
+    def report(self) -> str:
+        data = self.as_dict()
+        lines = [f"[BOOT] Startup took {data['total']:.2f}s"]
+        for name, seconds in self.phases.items():
+            lines.append(f"[BOOT]   {name:<24} {seconds * 1000:>9.1f} ms")
+        lines.append(f"[BOOT]   {'extension':<24} {'imports':>9}    {'setup':>9}")
+        slowest = sorted(
+            self.extensions.items(),
+            key=lambda item: -sum(item[1].values()),
+        )
+        for name, timings in slowest:
+            lines.append(
+                f"[BOOT]   {name:<24} {timings.get('imports', 0) * 1000:>9.1f} ms "
+                f"{timings.get('setup', 0) * 1000:>9.1f} ms"
+            )
+        for name, error in self.failed.items():
+            lines.append(f"[BOOT]   {name} failed: {error}")
+        return "\n".join(lines)
+
+    def finish(self) -> NoReturn:
+        """Closes open phases, prints the report and saves it. Runs only once."""
+        if self.finished:
+            return
+        self.finished = True
+        for name in list(self._open):
+            self.end(name)
+        print(self.report())
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.as_dict(), indent=2))
+        except OSError as e:
+            print(f"[BOOT] Error: Unable to save {self.path}: {e}")
+
+
+def extension_dependencies(extension: str) -> List[str]:
+    """Modules an extension imports at its top level, except the bot's own."""
+    spec = importlib.util.find_spec(extension)
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return []
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), spec.origin)
+
+    modules = []
+    # Imports inside functions are deferred on purpose, leave them alone.
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.append(node.module)
+    return [m for m in modules if m.split(".")[0] not in LOCAL_PACKAGES]
+
+
+def _import(module: str) -> float:
+    started = time.perf_counter()
+    try:
+        importlib.import_module(module)
+    except Exception:
+        # `load_extension` reports the real error when it hits the same import.
+        pass
+    return time.perf_counter() - started
+
+
+def prefetch(extensions: Iterable[str], workers: int = 8) -> Dict[str, float]:
+    """Imports the extensions' dependencies concurrently.
+
+    Returns the import time per extension. A module shared by several
+    extensions is counted for the first one that needs it.
+    """
+    owners: Dict[str, str] = {}
+    for extension in extensions:
+        try:
+            dependencies = extension_dependencies(extension)
+        except (ImportError, SyntaxError, OSError, ValueError):
+            continue
+        for module in dependencies:
+            if module not in sys.modules:
+                owners.setdefault(module, extension)
+
+    timings: Dict[str, float] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") as pool:
+        for module, seconds in zip(owners, pool.map(_import, owners)):
+            extension = owners[module]
+            timings[extension] = timings.get(extension, 0.0) + seconds
+    return timings
+
+
+def _installed(name: str) -> bool:
+    try:
+        metadata.version(name)
+        return True
+    except metadata.PackageNotFoundError:
+        # Backports such as `asyncio` or `datetime` are satisfied by the stdlib.
+        return name.isidentifier() and importlib.util.find_spec(name) is not None
+
+
+def _requirements(path: Path) -> List[Tuple[str, Optional[str]]]:
+    """(name, direct URL or None) of every requirement in `path`."""
+    try:
+        lines = path.read_text().splitlines()
+    except OSError as e:
+        print(f"[BOOT] Error: Unable to read {path}: {e}")
+        return []
+    requirements = []
+    for line in lines:
+        line = line.split("#", 1)[0]
+        match = REQUIREMENT_NAME.match(line)
+        if match:
+            url = REQUIREMENT_URL.search(line)
+            requirements.append((match.group(1), url.group(1) if url else None))
+    return requirements
+
+
+def check_requirements(path: Path) -> List[str]:
+    """Returns the requirements in `path` that are not installed."""
+    missing = []
+    for name, _ in _requirements(path):
+        if name not in missing and not _installed(name):
+            missing.append(name)
+    return missing
+
+
+def _normalize_url(url: str) -> str:
+    """Drops `git+`, a trailing `.git`, a `@ref` pin and case from a URL."""
+    url = url.split("#", 1)[0]
+    if url.startswith("git+"):
+        url = url[len("git+") :]
+    head, _, tail = url.rpartition("/")
+    url = f"{head}/{tail.split('@', 1)[0]}".rstrip("/").lower()
+    return url[: -len(".git")] if url.endswith(".git") else url
+
+
+def _installed_url(name: str) -> Optional[str]:
+    """The URL a distribution was installed from (PEP 610), None for an index install."""
+    try:
+        direct_url = metadata.distribution(name).read_text("direct_url.json")
+    except metadata.PackageNotFoundError:
+        return None
+    if not direct_url:
+        return None
+    try:
+        return json.loads(direct_url).get("url")
+    except ValueError:
+        return None
+
+
+def source_mismatches(path: Path) -> List[Tuple[str, str]]:
+    """Requirements pinned to a URL whose installed copy came from elsewhere.
+
+    Returns (name, wanted URL) pairs. Missing requirements are left to
+    `check_requirements`.
+    """
+    mismatches = []
+    for name, url in _requirements(path):
+        if url is None or not _installed(name):
+            continue
+        installed = _installed_url(name)
+        if installed is None or _normalize_url(installed) != _normalize_url(url):
+            mismatches.append((name, url))
+    return mismatches
+
+
+def installed_conflicts() -> List[str]:
+    conflicts = []
+    for name in CONFLICTS:
+        try:
+            metadata.version(name)
+            conflicts.append(name)
+        except metadata.PackageNotFoundError:
+            pass
+    return conflicts
+
+
+profiler = BootProfiler()
@@ -0,0 +1,141 @@
+"""
+Posts the bot's server and shard counts to bot-list websites.
+
+The providers come from `bot_lists` in `data/config.json`. Each entry has:
+
+- `name` - shown in the logs
+- `url` - the stats endpoint, `{bot_id}` is replaced with the bot's user id
+- `token_env` or `token_config` - the environment variable or config key that
+  holds the API token sent in the `Authorization` header
+- `payload` - maps each field of the request body to a stats snapshot
+  attribute, e.g. `{"server_count": "guilds"}`
+- `format` - `"json"` or `"form"` (the default) request body
+- `enabled` - set to false to keep an entry without posting to it
+
+`BotListPoster` checks the stats snapshot every `interval` seconds and only
+posts to a provider when the payload differs from the last one it accepted.
+A failed post is retried with exponential backoff, honouring `Retry-After`
+on rate limits. All requests go through the bot's shared `http_session`, so
+the event loop is never blocked on a bot list. Point a provider's `url` at
+`tools/botlist_stub.py` to try it without touching the real sites.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, NoReturn, Optional
+
+import aiohttp
+
+
+class BotListProvider:
+    """One bot-list endpoint and its retry state."""
+
+    def __init__(self, entry: Dict[str, Any], config: Dict[str, Any]) -> None:
+        self.name = entry.get("name", entry["url"])
+        self.url = entry["url"]
+        self.payload = entry.get("payload", {"server_count": "guilds"})
+        self.format = entry.get("format", "form")
+        if "token_env" in entry:
+            self.token = os.getenv(entry["token_env"])
+        else:
+            self.token = config.get(entry.get("token_config", ""))
+        self.last_posted: Optional[Dict[str, Any]] = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def build(self, stats) -> Dict[str, Any]:
+        return {field: getattr(stats, attribute) for field, attribute in self.payload.items()}
+
+    def backoff(self, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+        self.failures += 1
+        delay = min(base * 2 ** (self.failures - 1), cap)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.retry_at = time.monotonic() + delay
+        return delay
+
+
+class BotListPoster:
+    """Posts stats snapshots to every configured bot list when they change."""
+
+    def __init__(
+        self,
+        bot,
+        providers: List[Dict[str, Any]],
+        config: Dict[str, Any],
+        interval: float = 300.0,
+        backoff_base: float = 60.0,
+        backoff_cap: float = 3600.0,
+    ) -> None:
+        self.bot = bot
+        self.providers = [
+            BotListProvider(entry, config)
+            for entry in providers
+            if entry.get("enabled", True)
+        ]
+        self.interval = interval
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _post_one(self, provider: BotListProvider, stats) -> NoReturn:
+        payload = provider.build(stats)
+        if payload == provider.last_posted or time.monotonic() < provider.retry_at:
+            return
+
+        url = provider.url.format(bot_id=self.bot.user.id)
+        headers = {"Authorization": provider.token} if provider.token else {}
+        body = {"json": payload} if provider.format == "json" else {"data": payload}
+        try:
+            async with self.bot.http_session.post(url, headers=headers, **body) as response:
+                if response.status < 400:
+                    provider.last_posted = payload
+                    provider.failures = 0
+                    provider.retry_at = 0.0
+                    print(f"[BOTLISTS] {provider.name}: posted {payload}")
+                    return
+                retry_after = response.headers.get("Retry-After")
+                delay = provider.backoff(
+                    self.backoff_base,
+                    self.backoff_cap,
+                    float(retry_after) if retry_after else None,
+                )
+                print(
+                    f"[BOTLISTS] Error: {provider.name} answered {response.status}, "
+                    f"retrying in {delay:.0f}s"
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            delay = provider.backoff(self.backoff_base, self.backoff_cap)
+            print(f"[BOTLISTS] Error: {provider.name} failed ({e}), retrying in {delay:.0f}s")
+
+    async def post(self) -> NoReturn:
+        """Posts the latest stats to every provider that is due."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            stats = await self.bot.stats.get()
+            await asyncio.gather(*(self._post_one(p, stats) for p in self.providers))
+
+    def _next_delay(self) -> float:
+        """Seconds until the next check, or the next retry if that comes first."""
+        now = time.monotonic()
+        retries = [p.retry_at - now for p in self.providers if p.failures]
+        return max(1.0, min([self.interval] + retries))
+
+    async def _run(self) -> NoReturn:
+        await self.bot.wait_until_ready()
+        while True:
+            # The first wait also gives the stats snapshot time to cover every cluster.
+            await asyncio.sleep(self._next_delay())
+            await self.post()
+
+    def start(self) -> NoReturn:
+        if self.providers and (self._task is None or self._task.done()):
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def close(self) -> NoReturn:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -3,11 +3,18 @@ The CoreClient class is the main entry point for the Discord bot. It inherits fr
 
 The class has the following features:
 - Initializes the bot with a name, ID, and command prefix.
+- Owns the shared, pooled `http_session` that cogs use for HTTP requests. It is opened when the bot starts and closed with the bot.
+- Runs either every shard or, when started by the cluster launcher, only the shard ids of its cluster. `ipc` reports the cluster's counters to the launcher and `stats` holds the snapshot of the counters over all clusters.
 - Defines a loop that changes the bot's status every 110 seconds, displaying various activities and messages.
-- Provides an `update_status_on_dbl` method that updates the bot's server count on the Discord Bot List (DBL) website.
-- Handles the bot's ready event, loading the jishaku extension, changing the bot's presence, and connecting to a database.
+- Provides an `update_status_on_dbl` method that posts the bot's server count to the configured bot lists right away through `bot_lists`.
+- Handles the bot's ready event, loading the jishaku extension, changing the bot's presence, connecting to a database and printing the startup timing report.
 - Handles the bot's guild join and leave events, updating the bot's status on the DBL website.
-- Handles incoming messages, invoking the bot's commands using the NanoContext class.
+- Syncs only the application commands that changed since the last start, once the bot is ready (see `listener.core.commandsync`).
+- Registers stubs for the lazy extensions and loads the real extension when one of its commands is first used (see `listener.core.lazy`), counting command uses per cog.
+- Reloads extensions without losing state: cogs can export their state before the reload and import it into the new instance (`cog_export_state` / `cog_import_state`).
+- Refuses new commands once `shutdown` has started and tracks the running ones, so the shutdown coordinator can drain them (see `listener.core.shutdown`).
+- Resolves the guild's locale once before every prefix and slash command and attaches it to the context or interaction as `lang` and `strings`.
+- Handles incoming messages, invoking the bot's commands using the NanoContext class. Messages that do not start with a cached guild prefix or a mention of the bot are discarded before a context is built.
 """
 
 import asyncio
@@ -16,12 +23,23 @@ import os
 import random
 import sqlite3
 
-import aiohttp
 import disnake
 from disnake.ext import commands, tasks
 
+from listener.core.boot import profiler as boot
+from listener.core.botlists import BotListPoster
+from listener.core.cluster import ClusterInfo, IPCClient
+from listener.core.commandsync import CommandSync
+from listener.core.httpclient import create_session
+from listener.core.lazy import LazyExtensions
+from listener.core.prefixes import PrefixCache
+from listener.core.shutdown import ShutdownCoordinator
+from listener.core.stats import StatsService
+from listener.utils import Config, Settings, Strings
 from scripts import db  # UNCOMMENT FOR DB CONNECTION
 
+CONFIG = Config()
+
 
 class NanoContext(commands.Context):
     """ """
@@ -36,25 +54,138 @@ class CoreClient(commands.AutoShardedBot):
     """ """
 
     def __init__(
-        self, name="Helia", id=536892183404478483, command_prefix="n>", intents=None
+        self,
+        name="Helia",
+        id=536892183404478483,
+        command_prefix="n>",
+        intents=None,
+        cluster=None,
     ):
+        cluster = cluster or ClusterInfo()
         super(CoreClient, self).__init__(
             command_prefix=command_prefix,
+            shard_ids=cluster.shard_ids,
+            shard_count=cluster.shard_count,
             max_messages=None,
             intents=intents,
             chunk_guilds_at_startup=False,
             # sync_commands=True,
-            command_sync_flags=commands.CommandSyncFlags.all(),
+            # Commands are synced by `command_sync` once the bot is ready.
+            command_sync_flags=commands.CommandSyncFlags.none(),
         )
         self.name = name
         self.id = id
         self.command_prefix = command_prefix
+        self.prefix_cache = PrefixCache(CONFIG["default_prefix"])
+        self.cluster = cluster
+        self.ipc = IPCClient(cluster)
+        self.http_session = None
+        self.lazy = LazyExtensions(self)
+        self.command_sync = CommandSync(self)
+        self.commands_synced = False
+        self.shutdown = ShutdownCoordinator(
+            drain_timeout=CONFIG.get("shutdown_drain_timeout", 15)
+        )
+        self.add_listener(self.count_command_use, "on_command")
+        self.add_listener(self.count_command_use, "on_slash_command")
+        self.stats = StatsService(self)
+        self.bot_lists = BotListPoster(
+            self,
+            CONFIG.get("bot_lists", []),
+            CONFIG,
+            interval=CONFIG.get("bot_list_interval", 300),
+        )
+        self.before_invoke(self.resolve_locale)
+        self.before_slash_command_invoke(self.resolve_locale)
 
         # disnake Bot List updates.
         # self.dbl_token = os.environ['DBL_TOKEN']
         # self.BASE_URL = "https://discordbots.org/api/bots/458298539517411328/stats"
         # self.headers = {"Authorization": self.dbl_token}
 
+    async def resolve_locale(self, ctx):
+        """Attaches the guild's locale and string table to a context or interaction.
+
+        Commands read `ctx.strings` / `inter.strings` instead of looking up the
+        guild settings and the locale catalog themselves.
+        """
+        if getattr(ctx, "strings", None) is not None:
+            # Sub-commands run the hook again for the same interaction.
+            return
+        lang = CONFIG["default_locale"]
+        if ctx.guild is not None:
+            s = await Settings(ctx.guild.id)
+            lang = await s.get_field("locale", CONFIG["default_locale"])
+        ctx.lang = lang
+        ctx.strings = Strings(lang)
+
+    async def count_command_use(self, ctx):
+        command = getattr(ctx, "application_command", None) or ctx.command
+        self.lazy.count(command.cog_name if command else None)
+
+    async def process_application_commands(self, interaction):
+        if not self.shutdown.accepting:
+            await interaction.response.send_message(
+                "The bot is restarting, try again in a minute.", ephemeral=True
+            )
+            return
+        # Swap in a lazy extension before its stub would be dispatched.
+        self.lazy.load_for_slash(getattr(interaction.data, "name", None))
+        with self.shutdown.track():
+            await super(CoreClient, self).process_application_commands(interaction)
+
+    async def process_app_command_autocompletion(self, inter):
+        self.lazy.load_for_slash(getattr(inter.data, "name", None))
+        await super(CoreClient, self).process_app_command_autocompletion(inter)
+
+    def reload_extension(self, name, *, package=None):
+        """Reloads an extension, handing each cog's exported state to its new instance.
+
+        A cog opts in by defining `cog_export_state()`, called before the old
+        module is unloaded, and `cog_import_state(state)`, called on the new
+        cog (or on the restored old one, if the new code failed to load).
+        """
+        if name in self.lazy.pending:
+            # Never loaded yet, the first load already runs the current code.
+            # Failures are raised like those of a regular reload.
+            self.lazy.load(name, raise_errors=True)
+            return
+
+        states = {}
+        for cog_name, cog in list(self.cogs.items()):
+            module = type(cog).__module__
+            if module != name and not module.startswith(name + "."):
+                continue
+            if hasattr(cog, "cog_export_state"):
+                try:
+                    states[cog_name] = cog.cog_export_state()
+                except Exception as e:
+                    print(f"[RELOAD] Error: {cog_name} failed to export its state: {e}")
+
+        try:
+            super(CoreClient, self).reload_extension(name, package=package)
+        finally:
+            for cog_name, state in states.items():
+                cog = self.get_cog(cog_name)
+                if cog is None or not hasattr(cog, "cog_import_state"):
+                    continue
+                try:
+                    cog.cog_import_state(state)
+                    print(f"[RELOAD] {cog_name} state carried over")
+                except Exception as e:
+                    print(f"[RELOAD] Error: {cog_name} failed to import its state: {e}")
+
+    async def start(self, *args, **kwargs):
+        # The session has to be created inside the running event loop.
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = create_session(CONFIG.get("http"))
+        await super(CoreClient, self).start(*args, **kwargs)
+
+    async def close(self):
+        await super(CoreClient, self).close()
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+
     @tasks.loop(seconds=310)
     async def changeStatus(self):
         statuses = [
@@ -90,9 +221,8 @@ class CoreClient(commands.AutoShardedBot):
         )
 
     async def update_status_on_dbl(self):
-        payload = {"server_count": len(super(CoreClient, self).guilds)}
-        async with aiohttp.ClientSession() as session:
-            await session.post(self.BASE_URL, data=payload, headers=self.headers)
+        await self.stats.refresh()
+        await self.bot_lists.post()
 
     async def on_ready(self):
         activar = disnake.Activity(
@@ -107,8 +237,19 @@ class CoreClient(commands.AutoShardedBot):
         await super(CoreClient, self).change_presence(status=disnake.Status.online)
         # await self.update_status_on_dbl()
         print("[LAUNCH] Logged in as {}".format(super(CoreClient, self).user))
+        boot.end("gateway")
+        # Every cluster registers the same commands, one sync is enough.
+        if not self.commands_synced and self.cluster.cluster_id == 0:
+            self.commands_synced = True
+            with boot.phase("command sync"):
+                try:
+                    await self.command_sync.sync()
+                except disnake.HTTPException as e:
+                    print(f"[SYNC] Error: Unable to sync application commands: {e}")
+        boot.finish()
         try:
-            db.control()  # UNCOMMENT FOR DB CONNECTION
+            # Schema migrations may rebuild tables, keep them off the event loop.
+            await self.loop.run_in_executor(None, db.control)  # UNCOMMENT FOR DB CONNECTION
             print("[DB] Database up")  # DATABASE CONNECT LOG
         except sqlite3.OperationalError:
             print("[DB] Error: Unable to connect to the database")
@@ -128,6 +269,13 @@ class CoreClient(commands.AutoShardedBot):
         # await self.update_status_on_dbl()
 
     async def on_message(self, message):
-        if message.author.bot:
+        if message.author.bot or not self.shutdown.accepting:
+            return
+        guild_id = message.guild.id if message.guild else None
+        if not self.prefix_cache.matches(self.user, guild_id, message.content):
             return
-        await self.invoke(await self.get_context(message, cls=NanoContext))
+        ctx = await self.get_context(message, cls=NanoContext)
+        if ctx.command is None and self.lazy.load_for_prefix(ctx.invoked_with):
+            ctx = await self.get_context(message, cls=NanoContext)
+        with self.shutdown.track():
+            await self.invoke(ctx)
@@ -0,0 +1,266 @@
+"""
+Cluster layout and the IPC channel between the launcher and its bot processes.
+
+`launcher.py` splits the shard range into contiguous blocks and starts one
+`main.py` process per block. Each process learns its place in the cluster from
+environment variables (`CLUSTER_ID`, `CLUSTER_COUNT`, `SHARD_IDS`,
+`SHARD_COUNT` and `IPC_PORT`), which `ClusterInfo.from_env` reads back. Without
+them the bot runs as a single process that shards itself, as before.
+
+The IPC channel is newline-delimited JSON over a localhost TCP socket. Every
+cluster's `IPCClient` reports its guild, user, voice-client and shard counts to
+the launcher's `IPCServer` on an interval, and can ask the server for the
+totals over all clusters. The messages are:
+
+- `{"op": "stats", "cluster_id": 0, "stats": {...}}` from a cluster
+- `{"op": "query", "nonce": 1}` from a cluster, answered with
+  `{"op": "reply", "nonce": 1, "data": {...}}`
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from typing import Any, Dict, List, Mapping, NoReturn, Optional
+
+IPC_HOST = "127.0.0.1"
+
+
+def split_shards(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Splits the shard ids into `cluster_count` contiguous, near-equal blocks."""
+    base, extra = divmod(shard_count, cluster_count)
+    blocks, start = [], 0
+    for cluster_id in range(cluster_count):
+        size = base + (1 if cluster_id < extra else 0)
+        blocks.append(list(range(start, start + size)))
+        start += size
+    return blocks
+
+
+class ClusterInfo:
+    """Which shards this process runs and where the launcher listens."""
+
+    def __init__(
+        self,
+        cluster_id: int = 0,
+        cluster_count: int = 1,
+        shard_ids: Optional[List[int]] = None,
+        shard_count: Optional[int] = None,
+        ipc_port: Optional[int] = None,
+    ) -> None:
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.ipc_port = ipc_port
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "ClusterInfo":
+        shard_ids = environ.get("SHARD_IDS")
+        shard_count = environ.get("SHARD_COUNT")
+        ipc_port = environ.get("IPC_PORT")
+        return cls(
+            cluster_id=int(environ.get("CLUSTER_ID", 0)),
+            cluster_count=int(environ.get("CLUSTER_COUNT", 1)),
+            shard_ids=[int(i) for i in shard_ids.split(",")] if shard_ids else None,
+            shard_count=int(shard_count) if shard_count else None,
+            ipc_port=int(ipc_port) if ipc_port else None,
+        )
+
+    def to_env(self) -> Dict[str, str]:
+        env = {
+            "CLUSTER_ID": str(self.cluster_id),
+            "CLUSTER_COUNT": str(self.cluster_count),
+        }
+        if self.shard_ids is not None:
+            env["SHARD_IDS"] = ",".join(str(i) for i in self.shard_ids)
+        if self.shard_count is not None:
+            env["SHARD_COUNT"] = str(self.shard_count)
+        if self.ipc_port is not None:
+            env["IPC_PORT"] = str(self.ipc_port)
+        return env
+
+    @property
+    def clustered(self) -> bool:
+        """Whether this process was started by the launcher."""
+        return self.ipc_port is not None
+
+    @property
+    def name(self) -> str:
+        return f"cluster-{self.cluster_id}"
+
+
+async def send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> NoReturn:
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+
+
+async def receive(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Reads one message, or returns None once the peer has disconnected."""
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def combine(reports: Mapping[int, Mapping[str, Any]]) -> Dict[str, Any]:
+    """Sums the per-cluster counters into one result."""
+    totals: Dict[str, Any] = {"clusters": {str(i): dict(r) for i, r in reports.items()}}
+    for report in reports.values():
+        for key, value in report.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+class IPCServer:
+    """Launcher side of the IPC channel. Keeps the latest report of every cluster."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.reports: Dict[int, Dict[str, Any]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> NoReturn:
+        self._server = await asyncio.start_server(self._handle, IPC_HOST, self.port)
+        print(f"[IPC] Listening on {IPC_HOST}:{self.port}")
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> NoReturn:
+        try:
+            while True:
+                message = await receive(reader)
+                if message is None:
+                    break
+                if message.get("op") == "stats":
+                    report = dict(message.get("stats", {}))
+                    report["received"] = time.time()
+                    self.reports[int(message["cluster_id"])] = report
+                elif message.get("op") == "query":
+                    await send(
+                        writer,
+                        {"op": "reply", "nonce": message.get("nonce"), "data": self.totals()},
+                    )
+        except (ConnectionError, ValueError, KeyError) as e:
+            print(f"[IPC] Error: Dropping cluster connection: {e}")
+        finally:
+            writer.close()
+
+    def totals(self) -> Dict[str, Any]:
+        return combine(self.reports)
+
+    def forget(self, cluster_id: int) -> NoReturn:
+        """Drops the report of a cluster that exited, so totals do not count it."""
+        self.reports.pop(cluster_id, None)
+
+    async def close(self) -> NoReturn:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+class IPCClient:
+    """Cluster side of the IPC channel. Reports local counters to the launcher."""
+
+    def __init__(self, cluster: ClusterInfo, interval: float = 15.0) -> None:
+        self.cluster = cluster
+        self.interval = interval
+        self.bot = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._nonces = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+
+    def local_stats(self) -> Dict[str, Any]:
+        """This process's counters."""
+        bot = self.bot
+        latency = bot.latency
+        return {
+            "guilds": len(bot.guilds),
+            "users": sum(guild.member_count or 0 for guild in bot.guilds),
+            "voice_clients": len(bot.voice_clients),
+            "shards": len(bot.shards),
+            "music_players": len(bot.wavelink.players) if getattr(bot, "wavelink", None) else 0,
+            # `latency` is NaN until the first heartbeat.
+            "latency": latency if latency == latency else None,
+        }
+
+    def start(self, bot) -> NoReturn:
+        """Starts reporting to the launcher. Does nothing outside a cluster."""
+        self.bot = bot
+        if self.cluster.clustered and (self._task is None or self._task.done()):
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def _run(self) -> NoReturn:
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_connection(
+                    IPC_HOST, self.cluster.ipc_port
+                )
+                listener = asyncio.ensure_future(self._listen(reader))
+                try:
+                    while not listener.done():
+                        await send(
+                            self._writer,
+                            {
+                                "op": "stats",
+                                "cluster_id": self.cluster.cluster_id,
+                                "stats": self.local_stats(),
+                            },
+                        )
+                        await asyncio.wait([listener], timeout=self.interval)
+                finally:
+                    listener.cancel()
+                    self._disconnect()
+            except OSError as e:
+                print(f"[IPC] Error: Unable to reach the launcher: {e}")
+            await asyncio.sleep(5)
+
+    async def _listen(self, reader: asyncio.StreamReader) -> NoReturn:
+        while True:
+            message = await receive(reader)
+            if message is None:
+                return
+            future = self._pending.pop(message.get("nonce"), None)
+            if future is not None and not future.done():
+                future.set_result(message.get("data"))
+
+    def _disconnect(self) -> NoReturn:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("IPC connection lost"))
+        self._pending.clear()
+
+    def local_totals(self) -> Dict[str, Any]:
+        return combine({self.cluster.cluster_id: self.local_stats()})
+
+    async def totals(self, timeout: float = 5.0) -> Dict[str, Any]:
+        """Counters summed over every cluster.
+
+        Falls back to this process's own counters when it runs alone or the
+        launcher does not answer in time.
+        """
+        if self._writer is None:
+            return self.local_totals()
+
+        nonce = next(self._nonces)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[nonce] = future
+        try:
+            await send(self._writer, {"op": "query", "nonce": nonce})
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            self._pending.pop(nonce, None)
+            return self.local_totals()
+
+    async def close(self) -> NoReturn:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._disconnect()
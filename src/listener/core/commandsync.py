@@ -0,0 +1,152 @@
+"""
+Diff-based sync of the bot's global application commands.
+
+Syncing every command on every start costs REST calls and startup time, and a
+single invalid payload used to fail a whole extension load with error 50035.
+`CommandSync` instead hashes the payload of every registered global command
+and keeps the hashes, together with the command ids Discord assigned, in
+`data/command_sync.json`:
+
+- when the combined hash matches the stored one, nothing is sent at all
+- otherwise only the commands whose hash changed are created or edited, and
+  the ones that no longer exist are deleted, by their stored ids
+- without stored ids (first run, another application, or a command removed
+  behind the bot's back) the current commands are fetched once and compared to
+  find the ids and the differences
+
+A command Discord rejects is reported by name and left out of the stored
+state, so it is retried on the next start.
+"""
+
+import hashlib
+import json
+import os
+from os.path import abspath, dirname
+from typing import Any, Dict, NoReturn, Optional, Tuple
+
+import disnake
+
+STATE_PATH = dirname(abspath(__file__)) + "/../../data/command_sync.json"
+
+
+def digest(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def command_key(command: disnake.ApplicationCommand) -> str:
+    return f"{command.type.value}:{command.name}"
+
+
+class CommandSync:
+    """Pushes only the global application commands that changed since the last sync."""
+
+    def __init__(self, bot, path: str = STATE_PATH) -> None:
+        self.bot = bot
+        self.path = path
+
+    def local_commands(self) -> Dict[str, disnake.ApplicationCommand]:
+        return {
+            command_key(command.body): command.body
+            for command in self.bot.application_commands
+            if not command.guild_ids
+        }
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]) -> NoReturn:
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(temporary, self.path)
+
+    async def _apply(
+        self,
+        local: Dict[str, disnake.ApplicationCommand],
+        hashes: Dict[str, str],
+        known: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+        """Creates, edits and deletes commands against the ids in `known`.
+
+        Raises `disnake.NotFound` when a stored id no longer exists.
+        """
+        synced: Dict[str, Dict[str, Any]] = {}
+        counts = {"created": 0, "edited": 0, "deleted": 0, "failed": 0}
+        for key, body in local.items():
+            entry = known.get(key)
+            if entry is not None and entry["hash"] == hashes[key]:
+                synced[key] = entry
+                continue
+            try:
+                if entry is None:
+                    remote = await self.bot.create_global_command(body)
+                    counts["created"] += 1
+                else:
+                    remote = await self.bot.edit_global_command(entry["id"], body)
+                    counts["edited"] += 1
+            except disnake.NotFound:
+                raise
+            except disnake.HTTPException as e:
+                counts["failed"] += 1
+                print(f"[SYNC] Error: Discord rejected /{body.name}: {e}")
+                continue
+            synced[key] = {"id": remote.id, "hash": hashes[key]}
+
+        for key, entry in known.items():
+            if key not in local:
+                await self.bot.delete_global_command(entry["id"])
+                counts["deleted"] += 1
+        return synced, counts
+
+    async def _fetch_known(
+        self, local: Dict[str, disnake.ApplicationCommand], hashes: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Builds the id/hash state from the commands Discord currently has."""
+        known = {}
+        for remote in await self.bot.fetch_global_commands():
+            key = command_key(remote)
+            unchanged = key in local and local[key] == remote
+            known[key] = {"id": remote.id, "hash": hashes[key] if unchanged else None}
+        return known
+
+    async def sync(self, force: bool = False) -> Optional[Dict[str, int]]:
+        """Syncs the changed commands. Returns what was done, or None if nothing changed."""
+        local = self.local_commands()
+        hashes = {key: digest(body.to_dict()) for key, body in local.items()}
+        total = digest(sorted(hashes.items()))
+
+        state = self._load_state()
+        same_app = state.get("application_id") == self.bot.application_id
+        if same_app and state.get("hash") == total and not force:
+            print(f"[SYNC] {len(local)} application commands unchanged, skipping sync")
+            return None
+
+        known = state.get("commands", {}) if same_app and not force else {}
+        try:
+            if not known:
+                known = await self._fetch_known(local, hashes)
+            synced, counts = await self._apply(local, hashes, known)
+        except disnake.NotFound:
+            print("[SYNC] Stored command ids are stale, comparing with Discord")
+            synced, counts = await self._apply(
+                local, hashes, await self._fetch_known(local, hashes)
+            )
+
+        self._save_state(
+            {
+                "application_id": self.bot.application_id,
+                # Leave the combined hash stale if a command failed, to retry it.
+                "hash": total if not counts["failed"] else None,
+                "commands": synced,
+            }
+        )
+        print(
+            "[SYNC] Application commands synced: "
+            + ", ".join(f"{count} {action}" for action, count in counts.items())
+        )
+        return counts
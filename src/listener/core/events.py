@@ -0,0 +1,244 @@
+"""
+Structured JSON event log with an on-disk offset index.
+
+Command, error and membership events are written as one JSON object per line
+to segment files under `logs/events/`. Alongside every line the writer records
+its segment, byte offset, timestamp, kind, guild, user and command in a small
+SQLite index (`logs/events/index.db`). `EventLog.query` looks the matching
+offsets up in the index and reads only those lines back, so searching for one
+guild's errors never scans the whole log.
+
+`EventLog` reuses the batching of `LogSink`: `emit` only queues the record and
+the background writer appends and indexes whole batches from a worker thread.
+Segments are rolled over by size and the oldest ones are dropped together with
+their index rows. A batch is written as one unit: its index rows are inserted
+in an open transaction, the lines are appended, and only then is the
+transaction committed. If any step fails the transaction is rolled back and
+the segment is cut back to its old size, so a retried batch is neither
+duplicated in the segment nor missing from the index.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NoReturn, Optional, Tuple, Type
+
+from listener.core.logsink import LogSink
+
+INDEX_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS events("
+    "segment TEXT NOT NULL, offset INTEGER NOT NULL, ts REAL NOT NULL, "
+    "kind TEXT NOT NULL, guild_id TEXT, user_id TEXT, command TEXT)",
+    "CREATE INDEX IF NOT EXISTS events_ts ON events(ts)",
+    "CREATE INDEX IF NOT EXISTS events_guild ON events(guild_id, ts)",
+    "CREATE INDEX IF NOT EXISTS events_user ON events(user_id, ts)",
+    "CREATE INDEX IF NOT EXISTS events_command ON events(command, ts)",
+)
+
+# Filters accepted by `EventLog.query` and the index column each one uses.
+FILTERS = {
+    "kind": "kind",
+    "guild_id": "guild_id",
+    "user_id": "user_id",
+    "command": "command",
+}
+
+
+class EventLog(LogSink):
+    """Batched JSON-lines event log that indexes the offset of every record."""
+
+    # A locked index is as transient as a failed disk write.
+    retryable: Tuple[Type[BaseException], ...] = (OSError, sqlite3.OperationalError)
+
+    def __init__(
+        self,
+        directory: str = "logs/events",
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        max_bytes: int = 16 * 1024 * 1024,
+        backups: int = 8,
+    ) -> None:
+        super().__init__(
+            path=f"{directory}/index.db",
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_bytes=max_bytes,
+            backups=backups,
+            compress=False,
+        )
+        self.directory = Path(directory)
+        self._segment: Optional[Path] = None
+        self._index: Optional[sqlite3.Connection] = None
+        self._index_lock = threading.Lock()
+
+    def emit(
+        self,
+        kind: str,
+        guild_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        command: Optional[str] = None,
+        **data: Any,
+    ) -> NoReturn:
+        """Queues one event record."""
+        self._enqueue(
+            {
+                "ts": time.time(),
+                "kind": kind,
+                "guild_id": None if guild_id is None else str(guild_id),
+                "user_id": None if user_id is None else str(user_id),
+                "command": command,
+                "data": data,
+            }
+        )
+
+    def write(self, message: str) -> NoReturn:
+        self.emit("message", message=message)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Batches are indexed from the writer thread, queries from another.
+            self._index = sqlite3.connect(str(self.path), check_same_thread=False)
+            for statement in INDEX_SCHEMA:
+                self._index.execute(statement)
+            self._index.commit()
+        return self._index
+
+    def _current_segment(self) -> Path:
+        if self._segment is None:
+            segments = sorted(self.directory.glob("events-*.jsonl"))
+            self._segment = segments[-1] if segments else self._new_segment()
+        elif self._segment.stat().st_size >= self.max_bytes:
+            self._segment = self._new_segment()
+            self._drop_old_segments()
+        return self._segment
+
+    def _new_segment(self) -> Path:
+        segment = self.directory / f"events-{time.time_ns()}.jsonl"
+        segment.touch()
+        return segment
+
+    def _drop_old_segments(self) -> NoReturn:
+        segments = sorted(self.directory.glob("events-*.jsonl"))
+        for segment in segments[: max(len(segments) - self.backups, 0)]:
+            self._index.execute("DELETE FROM events WHERE segment = ?", (segment.name,))
+            segment.unlink()
+        self._index.commit()
+
+    def _write_lines(self, records: List[Dict[str, Any]]) -> NoReturn:
+        # Encoded up front, so a record json rejects is dropped on its own
+        # instead of failing the batch on every retry.
+        encoded = []
+        for record in records:
+            try:
+                line = json.dumps(record, ensure_ascii=False, default=str)
+            except (TypeError, ValueError) as e:
+                print(f"[LOG] Error: Dropped a {record['kind']} event: {e}")
+                continue
+            encoded.append((record, line.encode("utf-8") + b"\n"))
+        if not encoded:
+            return
+        records, lines = zip(*encoded)
+        with self._index_lock:
+            index = self._connect()
+            segment = self._current_segment()
+            start = segment.stat().st_size
+            rows = []
+            offset = start
+            for record, line in zip(records, lines):
+                rows.append(
+                    (
+                        segment.name,
+                        offset,
+                        record["ts"],
+                        record["kind"],
+                        record["guild_id"],
+                        record["user_id"],
+                        record["command"],
+                    )
+                )
+                offset += len(line)
+            try:
+                index.executemany(
+                    "INSERT INTO events(segment, offset, ts, kind, guild_id, user_id, "
+                    "command) VALUES(?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                with open(segment, "ab") as file:
+                    file.write(b"".join(lines))
+                index.commit()
+            except BaseException:
+                index.rollback()
+                if segment.exists() and segment.stat().st_size > start:
+                    os.truncate(segment, start)
+                raise
+
+    def _read(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        with self._index_lock:
+            hits = self._connect().execute(sql, params).fetchall()
+
+        records = []
+        files = {}
+        try:
+            for segment, offset in hits:
+                file = files.get(segment)
+                if file is None:
+                    try:
+                        file = files[segment] = open(self.directory / segment, "rb")
+                    except FileNotFoundError:
+                        continue
+                file.seek(offset)
+                records.append(json.loads(file.readline()))
+        finally:
+            for file in files.values():
+                file.close()
+        return records
+
+    async def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 20,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """Returns the newest events matching every given filter.
+
+        Filters are `kind`, `guild_id`, `user_id` and `command`; `since` and
+        `until` are UNIX timestamps. Pending records are flushed first so the
+        result includes events emitted just before the query.
+        """
+        clauses, params = [], []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name not in FILTERS:
+                raise ValueError(f"Unknown event filter: {name}")
+            clauses.append(f"{FILTERS[name]} = ?")
+            params.append(str(value))
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT segment, offset FROM events {where} ORDER BY ts DESC LIMIT ?"
+        params.append(limit)
+
+        await self.flush()
+        return await asyncio.get_event_loop().run_in_executor(None, self._read, sql, params)
+
+    async def close(self) -> NoReturn:
+        await super().close()
+        with self._index_lock:
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+
+events = EventLog()
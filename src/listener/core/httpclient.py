@@ -0,0 +1,46 @@
+"""
+The bot's shared HTTP client.
+
+`create_session` builds the one `aiohttp.ClientSession` the bot owns, exposed
+as `bot.http_session`. Cogs and services should make their requests through it
+instead of opening a session per call or using a blocking library, so that
+connections are pooled and reused. The limits come from the `http` section of
+`data/config.json`:
+
+- `limit` - open connections in total
+- `limit_per_host` - open connections to one host, so one slow API cannot take
+  the whole pool
+- `dns_cache_ttl` - seconds a resolved address is reused
+- `timeout` / `connect_timeout` - seconds for a whole request / for connecting
+"""
+
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+USER_AGENT = "Helia (https://github.com/pieckenst/helia)"
+
+DEFAULTS = {
+    "limit": 100,
+    "limit_per_host": 10,
+    "dns_cache_ttl": 300,
+    "timeout": 15,
+    "connect_timeout": 5,
+}
+
+
+def create_session(options: Optional[Dict[str, Any]] = None) -> aiohttp.ClientSession:
+    """Builds a pooled session. Must be called from a running event loop."""
+    settings = dict(DEFAULTS)
+    settings.update(options or {})
+    connector = aiohttp.TCPConnector(
+        limit=settings["limit"],
+        limit_per_host=settings["limit_per_host"],
+        ttl_dns_cache=settings["dns_cache_ttl"],
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings["timeout"], connect=settings["connect_timeout"]
+    )
+    return aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT}
+    )
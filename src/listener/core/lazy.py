@@ -0,0 +1,187 @@
+"""
+On-demand loading of rarely used extensions, and a per-cog usage report.
+
+Extensions listed under `lazy_extensions` in `data/config.json` are not
+imported at boot. Instead `LazyExtensions` registers a stub for each of their
+slash commands, built from the command payloads recorded in
+`data/lazy_manifest.json`, so Discord keeps showing the commands and the
+command sync sees no difference. The first time one of the commands (or one of
+the extension's prefix commands) is invoked, the stubs are removed, the real
+extension is loaded and the invocation is dispatched to it as usual.
+
+The manifest records a hash of every lazy extension's source. When the hash
+does not match, the extension is loaded normally at boot and its payloads are
+recorded again, so the stubs can never drift from the real commands.
+
+`LazyExtensions` also counts command uses per cog since boot; `usage_report`
+lists the cogs nobody has used, including lazy ones that were never loaded.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+from collections import Counter
+from os.path import abspath, dirname
+from typing import Any, Dict, Iterable, List, NoReturn, Optional
+
+import disnake
+from disnake.ext import commands
+
+MANIFEST_PATH = dirname(abspath(__file__)) + "/../../data/lazy_manifest.json"
+
+
+def source_hash(extension: str) -> Optional[str]:
+    spec = importlib.util.find_spec(extension)
+    if spec is None or not spec.origin:
+        return None
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+async def _unavailable(inter: disnake.ApplicationCommandInteraction, **kwargs: Any) -> NoReturn:
+    # Only reached when loading the real extension failed.
+    await inter.response.send_message(
+        "This command is temporarily unavailable.", ephemeral=True
+    )
+
+
+def build_stub(payload: Dict[str, Any]) -> commands.InvokableSlashCommand:
+    """A slash command that registers `payload` but has no implementation."""
+    permissions = payload.get("default_member_permissions")
+    stub = commands.InvokableSlashCommand(
+        _unavailable, name=payload["name"], description=payload.get("description", "-")
+    )
+    stub.body = disnake.SlashCommand(
+        name=payload["name"],
+        description=payload.get("description", "-"),
+        options=[disnake.Option.from_dict(option) for option in payload.get("options", [])],
+        dm_permission=payload.get("dm_permission"),
+        default_member_permissions=None if permissions is None else int(permissions),
+        nsfw=payload.get("nsfw"),
+    )
+    return stub
+
+
+class LazyExtensions:
+    """Stands in for lazy extensions until one of their commands is used."""
+
+    def __init__(self, bot, path: str = MANIFEST_PATH) -> None:
+        self.bot = bot
+        self.path = path
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        # Command name -> extension, for extensions that are not loaded yet.
+        self._slash: Dict[str, str] = {}
+        self._prefix: Dict[str, str] = {}
+        self.usage: Counter = Counter()
+
+    def _read_manifest(self) -> NoReturn:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+
+    def _write_manifest(self) -> NoReturn:
+        # Clusters may record at the same time, never leave a half-written file.
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temporary, self.path)
+
+    def _record(self, extension: str) -> NoReturn:
+        """Loads an extension for real and stores its command payloads."""
+        slash_before = set(self.bot.all_slash_commands)
+        prefix_before = set(self.bot.all_commands)
+        self.bot.load_extension(extension)
+        self.manifest[extension] = {
+            "hash": source_hash(extension),
+            "slash": [
+                self.bot.all_slash_commands[name].body.to_dict()
+                for name in sorted(set(self.bot.all_slash_commands) - slash_before)
+            ],
+            "prefix": sorted(set(self.bot.all_commands) - prefix_before),
+        }
+
+    def _register(self, extension: str) -> NoReturn:
+        entry = self.manifest[extension]
+        for payload in entry["slash"]:
+            self.bot.add_slash_command(build_stub(payload))
+            self._slash[payload["name"]] = extension
+        for name in entry["prefix"]:
+            self._prefix[name] = extension
+
+    def setup(self, extensions: Iterable[str]) -> List[str]:
+        """Registers stubs for every extension with an up-to-date manifest entry.
+
+        Extensions without one are loaded normally and recorded. Returns the
+        extensions that were deferred.
+        """
+        self._read_manifest()
+        deferred, changed = [], False
+        for extension in extensions:
+            entry = self.manifest.get(extension)
+            if entry is None or entry.get("hash") != source_hash(extension):
+                try:
+                    self._record(extension)
+                except commands.ExtensionError as e:
+                    print(f"[LAZY] Error: Unable to load {extension}: {e}")
+                    continue
+                changed = True
+                print(f"[LAZY] Recorded the commands of {extension}")
+                continue
+            self._register(extension)
+            deferred.append(extension)
+        if changed:
+            self._write_manifest()
+        return deferred
+
+    @property
+    def pending(self) -> List[str]:
+        """Lazy extensions that have not been loaded yet."""
+        return sorted(set(self._slash.values()) | set(self._prefix.values()))
+
+    def load(self, extension: str, raise_errors: bool = False) -> bool:
+        """Swaps an extension's stubs for the real commands.
+
+        A failed load puts the stubs back and returns False, or re-raises the
+        `ExtensionError` when `raise_errors` is set.
+        """
+        if extension not in self.pending:
+            return False
+        for name, owner in list(self._slash.items()):
+            if owner == extension:
+                self.bot.remove_slash_command(name)
+                del self._slash[name]
+        for name, owner in list(self._prefix.items()):
+            if owner == extension:
+                del self._prefix[name]
+        try:
+            self.bot.load_extension(extension)
+        except commands.ExtensionError as e:
+            print(f"[LAZY] Error: Unable to load {extension}: {e}")
+            # Put the stubs back so the commands answer instead of vanishing.
+            self._register(extension)
+            if raise_errors:
+                raise
+            return False
+        print(f"[LAZY] Loaded {extension} on first use")
+        return True
+
+    def load_for_slash(self, name: Optional[str]) -> bool:
+        extension = self._slash.get(name)
+        return extension is not None and self.load(extension)
+
+    def load_for_prefix(self, name: Optional[str]) -> bool:
+        extension = self._prefix.get(name)
+        return extension is not None and self.load(extension)
+
+    def count(self, cog_name: Optional[str]) -> NoReturn:
+        if cog_name:
+            self.usage[cog_name] += 1
+
+    def usage_report(self) -> Dict[str, Any]:
+        """Command uses per loaded cog, and the cogs and lazy extensions never used."""
+        used = {name: self.usage[name] for name in self.bot.cogs if self.usage[name]}
+        unused = sorted(name for name in self.bot.cogs if not self.usage[name])
+        return {"used": used, "unused": unused, "never_loaded": self.pending}
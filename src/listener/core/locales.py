@@ -0,0 +1,98 @@
+"""
+Registry of the bot's locale catalogs.
+
+Every `data/locales/<locale>/strings.json` and `commands.json` is parsed once at
+startup into a read-only mapping (nested objects become `MappingProxyType`,
+arrays become tuples), so `Strings(lang)` and `Commands(lang)` are dictionary
+lookups instead of a directory listing and a JSON parse per call. The catalogs
+are shared by every command, which is why they are frozen.
+
+When `locale_hot_reload` is enabled in the config, `LocaleCatalog.watch` polls
+the files and swaps in a fresh catalog whenever one of them changes on disk.
+"""
+
+import asyncio
+import json
+import os
+from os.path import abspath, dirname
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NoReturn, Optional, Tuple
+
+LOCALES_PATH = dirname(abspath(__file__)) + "/../../data/locales/"
+
+KINDS = ("strings", "commands")
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turns dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class LocaleCatalog:
+    """Preloaded, immutable `strings` and `commands` tables for every locale."""
+
+    def __init__(self, path: str = LOCALES_PATH, default_locale: str = "en_EN") -> None:
+        self.path = path
+        self.default_locale = default_locale
+        self._catalogs: Dict[str, Dict[str, Mapping]] = {kind: {} for kind in KINDS}
+        self._mtimes: Dict[Tuple[str, str], float] = {}
+
+    def _file(self, locale: str, kind: str) -> str:
+        return os.path.join(self.path, locale, f"{kind}.json")
+
+    def _read(self, locale: str, kind: str) -> NoReturn:
+        file = self._file(locale, kind)
+        mtime = os.path.getmtime(file)
+        with open(file, "r", encoding="utf-8") as f:
+            catalog = freeze(json.load(f))
+        self._catalogs[kind][locale] = catalog
+        self._mtimes[(locale, kind)] = mtime
+
+    def load(self, default_locale: Optional[str] = None) -> NoReturn:
+        """Reads every locale directory into memory."""
+        if default_locale is not None:
+            self.default_locale = default_locale
+
+        for locale in sorted(os.listdir(self.path)):
+            if not os.path.isdir(os.path.join(self.path, locale)):
+                continue
+            for kind in KINDS:
+                if os.path.exists(self._file(locale, kind)):
+                    self._read(locale, kind)
+
+    def get(self, kind: str, locale: str = "") -> Mapping:
+        """Returns a catalog, falling back to the default locale for unknown ones."""
+        catalogs = self._catalogs[kind]
+        if locale in catalogs:
+            return catalogs[locale]
+        return catalogs[self.default_locale]
+
+    def locales(self) -> List[str]:
+        return list(self._catalogs["strings"])
+
+    def reload_changed(self) -> List[Tuple[str, str]]:
+        """Re-reads the catalogs whose files changed and returns which ones did."""
+        changed = []
+        for (locale, kind), mtime in list(self._mtimes.items()):
+            try:
+                if os.path.getmtime(self._file(locale, kind)) != mtime:
+                    self._read(locale, kind)
+                    changed.append((locale, kind))
+            except (OSError, ValueError) as e:
+                # Keep serving the old catalog while the file is being edited.
+                print(f"[LOCALES] Error: Unable to reload {locale}/{kind}.json: {e}")
+        return changed
+
+    async def watch(self, interval: float = 5.0) -> NoReturn:
+        """Polls the locale files and hot-reloads the ones that changed."""
+        while True:
+            await asyncio.sleep(interval)
+            for locale, kind in self.reload_changed():
+                print(f"[LOCALES] Reloaded {locale}/{kind}.json")
+
+
+catalog = LocaleCatalog()
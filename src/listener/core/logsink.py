@@ -0,0 +1,142 @@
+"""
+Buffered, asynchronous sink for the bot's text log.
+
+Cogs used to open `logs/log.txt` and append a line on the event loop for every
+command, error and member event. `LogSink.write` only appends the line to an
+in-memory buffer; a background task writes the buffer in batches from a worker
+thread, either when `batch_size` lines are waiting or every `flush_interval`
+seconds. When the file grows past `max_bytes` it is rotated to a timestamped,
+gzip-compressed copy and only the newest `backups` copies are kept. `close`
+drains whatever is still buffered, so nothing is lost at shutdown.
+
+A batch that fails with one of the `retryable` errors (I/O errors by default)
+is put back in front of the buffer and written by the next flush; the buffer
+then keeps at most `max_buffer` entries and drops the oldest ones. Any other
+error would fail the same way on every retry, so that batch is dropped and
+reported instead of blocking everything queued after it.
+"""
+
+import asyncio
+import datetime
+import gzip
+import os
+import shutil
+from pathlib import Path
+from typing import List, NoReturn, Optional, Tuple, Type
+
+
+class LogSink:
+    """Queued log writer with batched flushes and size-based rotation."""
+
+    # Errors after which a batch is worth writing again on the next flush.
+    retryable: Tuple[Type[BaseException], ...] = (OSError,)
+
+    def __init__(
+        self,
+        path: str = "logs/log.txt",
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        max_bytes: int = 5 * 1024 * 1024,
+        backups: int = 5,
+        compress: bool = True,
+        max_buffer: int = 10000,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.max_buffer = max_buffer
+        self._buffer: List = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def format(self, message: str) -> str:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"[{timestamp}] {message}\n"
+
+    def write(self, message: str) -> NoReturn:
+        """Queues a line without touching the disk."""
+        self._enqueue(self.format(message))
+
+    def _enqueue(self, item) -> NoReturn:
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> NoReturn:
+        """Writes every buffered line, keeping their order across flushes."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            try:
+                await asyncio.get_event_loop().run_in_executor(
+                    None, self._write_lines, lines
+                )
+            except self.retryable as e:
+                # Put the batch back in front of anything queued meanwhile.
+                self._buffer[:0] = lines
+                print(f"[LOG] Error: Unable to write {self.path}: {e}")
+                dropped = len(self._buffer) - self.max_buffer
+                if dropped > 0:
+                    del self._buffer[:dropped]
+                    print(f"[LOG] Error: Dropped {dropped} oldest entries for {self.path}")
+            except Exception as e:
+                print(
+                    f"[LOG] Error: Dropped a batch of {len(lines)} entries for "
+                    f"{self.path}: {e!r}"
+                )
+
+    def _write_lines(self, lines: List[str]) -> NoReturn:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self._rotate()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    def _rotate(self) -> NoReturn:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = self.path.with_name(f"{self.path.name}.{stamp}")
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(
+                f"{rotated}.gz", "wb"
+            ) as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated)
+
+        old = sorted(self.path.parent.glob(f"{self.path.name}.*"))
+        for backup in old[: max(len(old) - self.backups, 0)]:
+            backup.unlink()
+
+    async def _run(self) -> NoReturn:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # A flush in progress must finish even if the task is cancelled.
+            await asyncio.shield(self.flush())
+
+    def start(self) -> NoReturn:
+        """Starts the background writer."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def close(self) -> NoReturn:
+        """Stops the background writer and drains the buffer."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+sink = LogSink()
@@ -0,0 +1,57 @@
+"""
+Event loop backend selection.
+
+`event_loop` in `data/config.json` picks the loop `main.py` runs the bot on:
+
+- `"auto"` (the default) - uvloop when it is installed, asyncio otherwise
+- `"uvloop"` - uvloop, falling back to asyncio with a warning when it is missing
+- `"asyncio"` - the standard library loop
+
+The policy has to be installed before the loop is created, and so before
+`CoreClient` (and the aiohttp session, locks and tasks it creates) exists.
+`describe` names the backend of a running loop for `/debug`.
+`tools/loop_bench.py` compares the backends on a simulated gateway stream.
+"""
+
+import asyncio
+from typing import Optional
+
+BACKENDS = ("auto", "uvloop", "asyncio")
+
+
+def install(backend: str = "auto") -> str:
+    """Installs the event loop policy for `backend` and returns the backend in use."""
+    if backend not in BACKENDS:
+        print(f"[LOOP] Error: Unknown event loop {backend!r}, expected one of {', '.join(BACKENDS)}")
+        backend = "auto"
+
+    if backend != "asyncio":
+        try:
+            import uvloop
+        except ImportError:
+            # uvloop has no Windows build, and it is an optional dependency.
+            if backend == "uvloop":
+                print("[LOOP] uvloop is not installed, falling back to asyncio")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            return "uvloop"
+
+    asyncio.set_event_loop_policy(None)
+    return "asyncio"
+
+
+def new_loop(backend: str = "auto") -> asyncio.AbstractEventLoop:
+    """Creates and sets the current thread's loop with the chosen backend."""
+    install(backend)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+def describe(loop: Optional[asyncio.AbstractEventLoop] = None) -> str:
+    loop = loop or asyncio.get_event_loop()
+    if type(loop).__module__.split(".")[0] == "uvloop":
+        import uvloop
+
+        return f"uvloop {uvloop.__version__}"
+    return f"asyncio ({type(loop).__name__})"
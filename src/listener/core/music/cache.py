@@ -0,0 +1,149 @@
+"""
+Shared cache of Lavalink track lookups.
+
+The same song is often requested in several guilds within minutes, and every
+`/play` used to send its query to the Lavalink node again. `TrackCache` sits in
+front of the lookup function:
+
+- results are kept per normalized query for `ttl` seconds; lookups that found
+  nothing only for `empty_ttl` seconds, so a failing node is retried soon
+- at most `max_entries` queries are kept, the least recently used go first
+- concurrent lookups of the same query share one request to the node, and a
+  caller that is cancelled does not cancel it for the others
+- failed lookups are not cached; every waiter gets the error
+
+`export` and `load` carry the entries and counters into a new cache, so the
+music cog keeps them across reloads.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+SEARCH_PREFIX = re.compile(r"^(\w+search):(.*)$", re.IGNORECASE | re.DOTALL)
+
+
+def normalize(query: str) -> str:
+    """Maps equivalent queries to one key.
+
+    Searches ignore case and repeated whitespace. URLs only get their scheme and
+    host lowercased, their paths and ids are case sensitive.
+    """
+    query = query.strip().strip("<>")
+    match = SEARCH_PREFIX.match(query)
+    if match:
+        return f"{match.group(1).lower()}:{' '.join(match.group(2).split()).casefold()}"
+    parts = urlsplit(query)
+    if parts.scheme and parts.netloc:
+        return urlunsplit(parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()))
+    return query
+
+
+def _retrieve(task: asyncio.Future) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class TrackCache:
+    """TTL and LRU cache with request coalescing for a track lookup coroutine."""
+
+    def __init__(
+        self,
+        resolve: Callable[[str], Awaitable[Any]],
+        ttl: float = 600.0,
+        empty_ttl: float = 30.0,
+        max_entries: int = 2048,
+    ) -> None:
+        self.resolve = resolve
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cached(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def _store(self, key: str, result: Any) -> None:
+        ttl = self.ttl if result else self.empty_ttl
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _lookup(self, key: str, query: str) -> Any:
+        try:
+            result = await self.resolve(query)
+            self._store(key, result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def get(self, query: str) -> Any:
+        """Returns the tracks for `query`, from the cache when possible."""
+        key = normalize(query)
+        found, result = self._cached(key)
+        if found:
+            self.hits += 1
+            return result
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[key] = asyncio.ensure_future(self._lookup(key, query))
+            # Shielded lookups outlive cancelled callers; a failure nobody
+            # awaits any more must not be reported as never retrieved.
+            task.add_done_callback(_retrieve)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def export(self) -> Dict[str, Any]:
+        """The cached entries and counters, for `load` on another cache."""
+        return {
+            "entries": list(self._entries.items()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """Takes over the entries and counters from `export`, oldest first."""
+        now = time.monotonic()
+        for key, entry in state["entries"]:
+            if entry[0] > now:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.hits += state["hits"]
+        self.misses += state["misses"]
+        self.coalesced += state["coalesced"]
+
+    def info(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,244 @@
+"""
+Pool of Lavalink nodes with load-aware player placement and failover.
+
+The nodes come from `lavalink_nodes` in `data/config.json`, with the same keys
+as `wavelink.Client.initiate_node` (`host`, `port`, `rest_uri`, `identifier`,
+`region`, ...). The password is either given as `password` or read from the
+environment variable named by `password_env`.
+
+New players go to the available node with the lowest penalty, computed from
+the stats the node reports like Lavalink's own load balancing does: one point
+per playing player, a curve over the system CPU load, and curves over the
+audio frames the node failed to send (deficit) or sent empty (nulled) in the
+last minute. A node that has not reported stats yet counts by its players.
+
+Track lookups also go to the least loaded node.
+
+wavelink 0.x reports node events only to the hook of each node, so the pool
+installs `hook` on every node it connects, and again on nodes that are already
+connected, so a reloaded cog takes over the hook of the running nodes.
+
+`Client.initiate_node` does not fail when a node cannot be reached: wavelink
+logs the error and keeps the node registered but unavailable. Every
+`check_interval` seconds the pool therefore connects the configured nodes that
+are not registered yet, reconnects registered ones that are unavailable and
+have no websocket listener (which would otherwise retry on its own), and
+checks the others. The players of a node
+that went unavailable are moved to the best remaining node with
+`Player.change_node`, which resumes the current track at its position. The
+queue lives on the player itself, so it moves along unchanged.
+
+Failover is driven by this polling only: wavelink 0.x does not report a lost
+node connection to the hook, so the players of a node that went down stay
+silent for up to `check_interval` seconds (`lavalink_check_interval`, 10 by
+default) before they are moved. A node that cannot be reached, or cannot hand
+its players to another node, is reported once until it recovers.
+
+Node entries without a `host` or `identifier` are skipped with an error.
+"""
+
+import asyncio
+import math
+import os
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NoReturn, Optional, Set
+
+# Keys every entry of `lavalink_nodes` must have.
+REQUIRED_KEYS = ("host", "identifier")
+
+DEFAULT_NODES = [
+    {
+        "host": "n17.danbot.host",
+        "port": 1679,
+        "rest_uri": "http://n17.danbot.host:1679",
+        "password": "DBH",
+        "identifier": "MAIN",
+        "region": "europe",
+    }
+]
+
+
+def penalty(node) -> float:
+    """Load score of a node, lower is better. Unavailable nodes are infinite."""
+    if not getattr(node, "is_available", True):
+        return math.inf
+    stats = getattr(node, "stats", None)
+    if stats is None:
+        return float(len(node.players))
+
+    score = float(getattr(stats, "playing_players", 0))
+    cpu_cores = max(getattr(stats, "cpu_cores", 1) or 1, 1)
+    system_load = getattr(stats, "system_load", 0.0) or 0.0
+    # Some versions report the load per core, some in total.
+    if system_load > 1:
+        system_load /= cpu_cores
+    score += 1.05 ** (100 * system_load) * 10 - 10
+
+    deficit = getattr(stats, "frames_deficit", -1)
+    nulled = getattr(stats, "frames_nulled", -1)
+    if deficit is not None and deficit >= 0:
+        score += 1.03 ** (500 * deficit / 3000) * 600 - 600
+    if nulled is not None and nulled >= 0:
+        score += (1.03 ** (500 * nulled / 3000) * 300 - 300) * 2
+    return score
+
+
+class NodePool:
+    """Connects the configured nodes, picks the least loaded one and fails over."""
+
+    def __init__(
+        self,
+        client,
+        nodes: Optional[List[Dict[str, Any]]] = None,
+        check_interval: float = 10.0,
+        hook: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ) -> None:
+        self.client = client
+        self.nodes = []
+        for node in nodes or DEFAULT_NODES:
+            if not node.get("enabled", True):
+                continue
+            missing = [key for key in REQUIRED_KEYS if not node.get(key)]
+            if missing:
+                print(
+                    f"[NODES] Error: Skipped a node without {', '.join(missing)}: "
+                    f"{node.get('identifier') or node.get('host')}"
+                )
+                continue
+            self.nodes.append(dict(node))
+        self.check_interval = check_interval
+        self.hook = hook
+        self.migrated = 0
+        # Nodes already reported as unreachable or stuck with their players.
+        self._unreachable: Set[str] = set()
+        self._stranded: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> NoReturn:
+        """Connects every configured node that is not connected yet."""
+        for options in self.nodes:
+            options = dict(options)
+            if "password_env" in options:
+                options["password"] = os.getenv(options.pop("password_env"), "")
+            options.pop("enabled", None)
+            identifier = options["identifier"]
+            node = self.client.nodes.get(identifier)
+            try:
+                if node is None:
+                    node = await self.client.initiate_node(**options)
+                elif node.is_available or self._listening(node):
+                    if node.is_available:
+                        self._unreachable.discard(identifier)
+                    self._set_hook(node)
+                    continue
+                else:
+                    await node.connect(self.client.bot)
+                self._set_hook(node)
+            except Exception as e:
+                # The monitor keeps the other nodes serving meanwhile.
+                if identifier not in self._unreachable:
+                    self._unreachable.add(identifier)
+                    print(f"[NODES] Error: Unable to connect {identifier}: {e}")
+                continue
+            if node.is_available:
+                self._unreachable.discard(identifier)
+                print(f"[NODES] Connected {identifier} ({options['host']})")
+            elif identifier not in self._unreachable:
+                self._unreachable.add(identifier)
+                print(
+                    f"[NODES] Error: Unable to connect {identifier} ({options['host']}), "
+                    f"retrying every {self.check_interval:g}s"
+                )
+
+    @staticmethod
+    def _listening(node) -> bool:
+        """Whether wavelink's websocket listener runs, which reconnects by itself."""
+        task = getattr(getattr(node, "_websocket", None), "_task", None)
+        return task is not None and not task.done()
+
+    def _set_hook(self, node) -> NoReturn:
+        if self.hook is not None:
+            node.set_hook(self.hook)
+
+    def available(self, exclude: Iterable[str] = ()) -> List[Any]:
+        excluded = set(exclude)
+        return [
+            node
+            for identifier, node in self.client.nodes.items()
+            if identifier not in excluded and penalty(node) != math.inf
+        ]
+
+    def best(self, exclude: Iterable[str] = ()) -> Optional[Any]:
+        """The available node with the lowest penalty, or None."""
+        nodes = self.available(exclude)
+        return min(nodes, key=penalty) if nodes else None
+
+    async def get_tracks(self, query: str) -> Any:
+        """Resolves `query` on the least loaded node."""
+        node = self.best()
+        if node is None:
+            # Raises wavelink's own error when no node is connected at all.
+            return await self.client.get_tracks(query)
+        return await node.get_tracks(query)
+
+    async def failover(self, node) -> int:
+        """Moves the players of `node` to the best other node. Returns how many moved."""
+        moved = 0
+        for player in list(node.players.values()):
+            target = self.best(exclude=[node.identifier])
+            if target is None:
+                if node.identifier not in self._stranded:
+                    self._stranded.add(node.identifier)
+                    print(
+                        f"[NODES] Error: No node left to take the players of "
+                        f"{node.identifier}"
+                    )
+                break
+            try:
+                await player.change_node(target.identifier)
+                moved += 1
+            except Exception as e:
+                print(f"[NODES] Error: Unable to move player {player.guild_id}: {e}")
+        if moved:
+            self.migrated += moved
+            print(f"[NODES] Moved {moved} player(s) off {node.identifier}")
+        return moved
+
+    async def check(self) -> NoReturn:
+        for node in list(self.client.nodes.values()):
+            if penalty(node) != math.inf:
+                self._stranded.discard(node.identifier)
+            elif node.players:
+                await self.failover(node)
+
+    async def _run(self, bot) -> NoReturn:
+        await bot.wait_until_ready()
+        try:
+            await self.connect()
+        except Exception as e:
+            print(f"[NODES] Error: Unable to connect the nodes: {e}")
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                # Nodes that could not be reached at boot are retried here.
+                await self.connect()
+                await self.check()
+            except Exception as e:
+                print(f"[NODES] Error: Node check failed: {e}")
+
+    def start(self, bot) -> NoReturn:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run(bot))
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            identifier: {
+                "players": len(node.players),
+                "penalty": penalty(node),
+            }
+            for identifier, node in self.client.nodes.items()
+        }
+
+    def close(self) -> NoReturn:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
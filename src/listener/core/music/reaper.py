@@ -0,0 +1,206 @@
+"""
+Frees music players nobody is listening to.
+
+wavelink keeps every player `Music.get_player` ever created, including the ones
+made by a stray `/queue` in a guild that never played anything, and a player
+that finished its queue stays connected forever. `PlayerReaper` sweeps the
+players every `interval` seconds and tears down the ones that
+
+- have not been playing (stopped, finished or paused) for `idle_timeout`
+  seconds, or
+- sit in a voice channel without any human for `empty_timeout` seconds.
+
+Tearing down leaves the voice channel, destroys the player on its node and
+drops it together with its queue. When a `GuildMusicManager` is given, its
+guild voice states whose voice client is gone are cleaned up as well, which
+also frees their queued FFmpeg sources.
+
+Each sweep that frees something is logged and recorded as a `music_reap`
+event. `info` holds the totals, which `/debug` shows.
+
+`export` and `load` carry the totals and running countdowns into a new reaper,
+so the music cog keeps them across reloads.
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, Dict, NoReturn, Optional
+
+from listener.core.events import events as event_log
+
+
+def footprint(player) -> int:
+    """Rough size in bytes of a player's queue and its tracks."""
+    queue = getattr(player, "queue", None)
+    if queue is None:
+        return 0
+    size = sys.getsizeof(queue)
+    tracks = [getattr(queue, "_current", None)]
+    for name in ("_history", "_upcoming"):
+        container = getattr(queue, name, ())
+        size += sys.getsizeof(container)
+        tracks.extend(container)
+    for track in tracks:
+        if track is not None:
+            size += sys.getsizeof(track) + sys.getsizeof(getattr(track, "info", None))
+    return size
+
+
+class PlayerReaper:
+    """Periodically tears down idle players and players in empty channels."""
+
+    def __init__(
+        self,
+        bot,
+        client,
+        interval: float = 30.0,
+        idle_timeout: float = 300.0,
+        empty_timeout: float = 60.0,
+        manager=None,
+    ) -> None:
+        self.bot = bot
+        self.client = client
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.empty_timeout = empty_timeout
+        self.manager = manager
+        self.reaped = 0
+        self.reaped_states = 0
+        self.reclaimed = 0
+        self.last_sweep: Optional[float] = None
+        self._idle_since: Dict[int, float] = {}
+        self._empty_since: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_empty(self, guild_id: int) -> NoReturn:
+        """Starts the empty-channel countdown now instead of at the next sweep."""
+        self._empty_since.setdefault(guild_id, time.monotonic())
+
+    def _is_empty(self, player) -> bool:
+        channel_id = getattr(player, "channel_id", None)
+        guild = self.bot.get_guild(player.guild_id)
+        if channel_id is None or guild is None:
+            return False
+        channel = guild.get_channel(int(channel_id))
+        return channel is None or not [m for m in channel.members if not m.bot]
+
+    def _due(self, player, now: float) -> Optional[str]:
+        guild_id = player.guild_id
+        if player.is_playing and not getattr(player, "is_paused", False):
+            self._idle_since.pop(guild_id, None)
+        elif now - self._idle_since.setdefault(guild_id, now) >= self.idle_timeout:
+            return "idle"
+
+        if not self._is_empty(player):
+            self._empty_since.pop(guild_id, None)
+        elif now - self._empty_since.setdefault(guild_id, now) >= self.empty_timeout:
+            return "empty"
+        return None
+
+    async def _reap(self, player) -> int:
+        size = footprint(player)
+        try:
+            await player.teardown()
+        except Exception as e:
+            print(f"[REAPER] Error: Unable to tear down player {player.guild_id}: {e}")
+        # Make sure the player is gone even if the node or voice part failed.
+        player.node.players.pop(player.guild_id, None)
+        self._idle_since.pop(player.guild_id, None)
+        self._empty_since.pop(player.guild_id, None)
+        return size
+
+    def _sweep_states(self) -> int:
+        states = getattr(self.manager, "guild_voice_states", {})
+        freed = 0
+        for guild_id, state in list(states.items()):
+            voice_client = state.voice_client
+            if voice_client is None or not voice_client.is_connected():
+                state.cleanup()
+                del states[guild_id]
+                freed += 1
+        return freed
+
+    async def sweep(self) -> Dict[str, Any]:
+        """Frees everything that is due and returns what was freed."""
+        now = time.monotonic()
+        reasons = {"idle": 0, "empty": 0}
+        reclaimed = 0
+        for player in list(self.client.players.values()):
+            reason = self._due(player, now)
+            if reason is not None:
+                reclaimed += await self._reap(player)
+                reasons[reason] += 1
+        # Forget guilds whose players were removed some other way.
+        for since in (self._idle_since, self._empty_since):
+            for guild_id in [g for g in since if g not in self.client.players]:
+                del since[guild_id]
+        states = self._sweep_states() if self.manager is not None else 0
+
+        freed = reasons["idle"] + reasons["empty"]
+        self.reaped += freed
+        self.reaped_states += states
+        self.reclaimed += reclaimed
+        self.last_sweep = time.time()
+        result = {
+            **reasons,
+            "states": states,
+            "reclaimed_bytes": reclaimed,
+            "players": len(self.client.players),
+        }
+        if freed or states:
+            print(
+                f"[REAPER] Freed {reasons['idle']} idle and {reasons['empty']} empty-channel "
+                f"player(s), {states} voice state(s), ~{reclaimed / 1024:.1f} KiB; "
+                f"{result['players']} player(s) left"
+            )
+            event_log.emit("music_reap", **result)
+        return result
+
+    async def _run(self) -> NoReturn:
+        await self.bot.wait_until_ready()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"[REAPER] Error: Sweep failed: {e}")
+
+    def start(self) -> NoReturn:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def export(self) -> Dict[str, Any]:
+        """The totals and countdowns, for `load` on another reaper."""
+        return {
+            "reaped": self.reaped,
+            "reaped_states": self.reaped_states,
+            "reclaimed": self.reclaimed,
+            "last_sweep": self.last_sweep,
+            "idle_since": dict(self._idle_since),
+            "empty_since": dict(self._empty_since),
+        }
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """Takes over the totals and countdowns from `export`."""
+        self.reaped += state["reaped"]
+        self.reaped_states += state["reaped_states"]
+        self.reclaimed += state["reclaimed"]
+        self.last_sweep = state["last_sweep"]
+        # Both reapers share the process, so the monotonic stamps stay valid.
+        self._idle_since.update(state["idle_since"])
+        self._empty_since.update(state["empty_since"])
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "players": len(self.client.players),
+            "reaped": self.reaped,
+            "reaped_states": self.reaped_states,
+            "reclaimed_bytes": self.reclaimed,
+            "last_sweep": self.last_sweep,
+        }
+
+    def close(self) -> NoReturn:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
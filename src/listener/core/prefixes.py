@@ -0,0 +1,49 @@
+"""
+Per-guild prefix cache used to resolve and match command prefixes.
+
+`CoreClient.on_message` asks the cache whether a message can be a command at all
+before building a `NanoContext`, so ordinary chat never reaches the command
+machinery. Each guild's prefixes are resolved once from the settings store into
+a tuple that `str.startswith` matches in a single call, and stay cached until
+`/prefix` invalidates them.
+"""
+
+from typing import Dict, NoReturn, Optional, Tuple
+
+from disnake import ClientUser
+
+from listener.core.settings import store as settings_store
+
+
+class PrefixCache:
+    """Caches the prefix tuple of every guild the bot has seen a message from."""
+
+    def __init__(self, default_prefix: str) -> None:
+        self.default_prefix = default_prefix
+        self._prefixes: Dict[Optional[int], Tuple[str, ...]] = {}
+
+    def get(self, user: ClientUser, guild_id: Optional[int]) -> Tuple[str, ...]:
+        """Returns the prefixes for a guild, or the default ones for DMs."""
+        prefixes = self._prefixes.get(guild_id)
+        if prefixes is None:
+            prefix = self.default_prefix
+            if guild_id is not None:
+                prefix = settings_store.guild(guild_id).get("prefix") or prefix
+            prefixes = self._prefixes[guild_id] = (
+                user.mention + " ",
+                f"<@!{user.id}> ",
+                prefix,
+                prefix + " ",
+            )
+        return prefixes
+
+    def matches(self, user: ClientUser, guild_id: Optional[int], content: str) -> bool:
+        """Checks whether a message starts with any prefix or a mention of the bot."""
+        return content.startswith(self.get(user, guild_id))
+
+    def invalidate(self, guild_id: Optional[int] = None) -> NoReturn:
+        """Drops the cached prefixes of a guild, or of every guild if none is given."""
+        if guild_id is None:
+            self._prefixes.clear()
+        else:
+            self._prefixes.pop(guild_id, None)
@@ -0,0 +1,183 @@
+"""
+Process-wide store for guild settings.
+
+Settings live in the `settings` table of `db/botmaindata.db`, one row per guild
+and field, keyed by `(guild_id, field)`. Values are stored JSON-encoded so any
+value `Settings.set_field` accepts round-trips unchanged.
+
+The `SettingsStore` serves reads from memory: every row is read once when the
+store is loaded at boot, so looking a guild up never touches the database on
+the event loop, where it would wait for a flush holding the connection.
+Changed fields are persisted with write-behind flushes that upsert only the
+dirty `(guild_id, field)` pairs, either on a timer or when the store is closed
+at shutdown.
+
+The old `data/settings.json` blob and the legacy `prefixes.json` are imported
+into the table once, the first time the store is opened.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from os.path import abspath, dirname
+from pathlib import Path
+from typing import Any, Dict, NoReturn, Optional, Set, Tuple
+
+from scripts import db
+
+SETTINGS_PATH = dirname(abspath(__file__)) + "/../../data/settings.json"
+PREFIXES_PATH = Path.cwd() / "prefixes.json"
+
+MIGRATION_KEY = "settings_json_migrated"
+
+
+class SettingsStore:
+    """In-memory guild settings with batched write-behind persistence to SQLite."""
+
+    def __init__(self, path: Path = db.main, flush_interval: float = 30.0) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_lock = threading.Lock()
+        self._guilds: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Flushes run in an executor thread, reads on the event loop.
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.execute(db.SETTINGS_SCHEMA)
+            self._connection.execute(db.META_SCHEMA)
+            self._connection.commit()
+            self._migrate_json()
+        return self._connection
+
+    def _migrate_json(self) -> NoReturn:
+        """Imports settings.json and prefixes.json into the settings table once."""
+        connection = self._connection
+        if connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (MIGRATION_KEY,)
+        ).fetchone():
+            return
+
+        rows = {}
+        try:
+            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
+                for guild_id, fields in json.load(f).items():
+                    for field, value in fields.items():
+                        rows[(str(guild_id), field)] = json.dumps(value)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        try:
+            with open(PREFIXES_PATH, "r", encoding="utf-8") as f:
+                for guild_id, prefixes in json.load(f).items():
+                    key = (str(guild_id), "prefix")
+                    if prefixes and rows.get(key, "null") == "null":
+                        rows[key] = json.dumps(prefixes[0])
+        except (FileNotFoundError, ValueError):
+            pass
+
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO settings(guild_id, field, value) VALUES(?, ?, ?)",
+                [(guild_id, field, value) for (guild_id, field), value in rows.items()],
+            )
+            # Another cluster may have imported the same files meanwhile.
+            connection.execute(
+                "INSERT OR IGNORE INTO meta(key, value) VALUES(?, ?)",
+                (MIGRATION_KEY, "1"),
+            )
+        print(f"[SETTINGS] Migrated {len(rows)} settings fields to the database")
+
+    def load(self) -> NoReturn:
+        """Opens the database, running the one-shot JSON migration if needed,
+        and caches the settings of every guild."""
+        with self._connection_lock:
+            connection = self._connect()
+            if self._loaded:
+                return
+            rows = connection.execute("SELECT guild_id, field, value FROM settings")
+            for guild_id, field, value in rows:
+                self._guilds.setdefault(guild_id, {})[field] = json.loads(value)
+            self._loaded = True
+        print(f"[SETTINGS] Loaded the settings of {len(self._guilds)} guilds")
+
+    def guild(self, guild_id: int) -> Dict[str, Any]:
+        """Returns the cached settings of a guild."""
+        if not self._loaded:
+            self.load()
+        return self._guilds.setdefault(str(guild_id), {})
+
+    def set(self, guild_id: int, field: str, value: Any) -> NoReturn:
+        self.guild(guild_id)[field] = value
+        self._dirty.add((str(guild_id), field))
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    async def flush(self) -> NoReturn:
+        """Upserts every field changed since the last flush in one transaction."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._dirty:
+                return
+
+            dirty, self._dirty = self._dirty, set()
+            rows = [
+                (guild_id, field, json.dumps(self._guilds[guild_id].get(field)))
+                for guild_id, field in dirty
+            ]
+            try:
+                await asyncio.get_event_loop().run_in_executor(None, self._write, rows)
+            except Exception as e:
+                # Keep the fields dirty so the next flush retries them.
+                self._dirty |= dirty
+                print(f"[SETTINGS] Error: Unable to save settings: {e}")
+
+    def _write(self, rows) -> NoReturn:
+        with self._connection_lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO settings(guild_id, field, value) VALUES(?, ?, ?) "
+                    "ON CONFLICT(guild_id, field) DO UPDATE SET value = excluded.value",
+                    rows,
+                )
+
+    async def _flush_loop(self) -> NoReturn:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # A flush in progress must finish even if the loop is cancelled.
+            await asyncio.shield(self.flush())
+
+    def start(self, flush_interval: Optional[float] = None) -> NoReturn:
+        """Opens the database and starts the periodic flush task."""
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        self.load()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._flush_loop())
+
+    async def close(self) -> NoReturn:
+        """Stops the flush task and writes any pending changes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        print("[SETTINGS] Pending settings saved")
+
+
+store = SettingsStore()
@@ -0,0 +1,121 @@
+"""
+Graceful shutdown of the bot.
+
+`ShutdownCoordinator.shutdown` runs the same steps no matter whether `/shutdown`,
+SIGTERM or a lost connection ended the bot:
+
+1. Stop intake. New commands are refused, and interactions get a short
+   "restarting" reply instead of timing out.
+2. Drain. Commands that are already running get up to `drain_timeout` seconds
+   to finish. `CoreClient` wraps every command invocation in `track`.
+3. Flush the registered sinks in ascending `order`: music players, the gateway
+   connection, settings, event and text logs, IPC and the database pool. Each
+   sink gets `sink_timeout` seconds, and one failing sink does not stop the
+   rest.
+4. Print a timing report of every step.
+
+`shutdown` runs once. Later calls wait for the first run to finish, so
+`main()` can simply await it after `client.start` returns.
+"""
+
+import asyncio
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NoReturn, Optional, Tuple
+
+
+class ShutdownCoordinator:
+    """Stops intake, drains running commands and flushes sinks in order."""
+
+    def __init__(self, drain_timeout: float = 15.0, sink_timeout: float = 10.0) -> None:
+        self.drain_timeout = drain_timeout
+        self.sink_timeout = sink_timeout
+        self.accepting = True
+        self.timings: Dict[str, float] = {}
+        self._inflight = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._sinks: List[Tuple[int, str, Callable[[], Any]]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def _idle_event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Marks a command as running for the duration of the block."""
+        self._inflight += 1
+        self._idle_event().clear()
+        try:
+            yield
+        finally:
+            self._inflight -= 1
+            if self._inflight == 0:
+                self._idle_event().set()
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def register(self, name: str, flush: Callable[[], Any], order: int = 100) -> NoReturn:
+        """Adds a sink. `flush` may be a plain function or a coroutine function."""
+        self.unregister(name)
+        self._sinks.append((order, name, flush))
+        self._sinks.sort(key=lambda sink: sink[0])
+
+    def unregister(self, name: str) -> NoReturn:
+        self._sinks = [sink for sink in self._sinks if sink[1] != name]
+
+    async def _drain(self) -> int:
+        """Waits for running commands and returns how many were still running."""
+        try:
+            await asyncio.wait_for(self._idle_event().wait(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._inflight
+
+    async def _flush(self, name: str, flush: Callable[[], Any]) -> NoReturn:
+        try:
+            result = flush()
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, self.sink_timeout)
+        except asyncio.TimeoutError:
+            print(f"[SHUTDOWN] Error: {name} did not finish in {self.sink_timeout:.0f}s")
+        except Exception as e:
+            print(f"[SHUTDOWN] Error: {name} failed: {type(e).__name__}: {e}")
+
+    async def _run(self) -> Dict[str, float]:
+        started = time.perf_counter()
+        self.accepting = False
+        print(f"[SHUTDOWN] Intake stopped, waiting for {self._inflight} running command(s)")
+
+        step = time.perf_counter()
+        left = await self._drain()
+        self.timings["drain"] = time.perf_counter() - step
+        if left:
+            print(f"[SHUTDOWN] {left} command(s) still running after {self.drain_timeout:.0f}s")
+
+        for _, name, flush in list(self._sinks):
+            step = time.perf_counter()
+            await self._flush(name, flush)
+            self.timings[name] = time.perf_counter() - step
+
+        self.timings["total"] = time.perf_counter() - started
+        print(self.report())
+        return self.timings
+
+    def report(self) -> str:
+        lines = ["[SHUTDOWN] Shutdown report"]
+        for name, seconds in self.timings.items():
+            lines.append(f"[SHUTDOWN]   {name:<16} {seconds * 1000:>9.1f} ms")
+        return "\n".join(lines)
+
+    async def shutdown(self) -> Dict[str, float]:
+        """Runs the shutdown once; concurrent and later calls wait for that run."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        # Shielded so a cancelled caller cannot abort the flushes halfway.
+        return await asyncio.shield(self._task)
@@ -0,0 +1,85 @@
+"""
+Aggregated bot statistics shared by the bot-list updater, `/about` and `/debug`.
+
+Walking `bot.guilds` only counts this process's shards and costs a pass over
+every guild per call. `StatsService` instead refreshes one `StatsSnapshot` on an
+interval: it asks the launcher over IPC for the guild, user, voice-client and
+shard counts summed over every cluster (see `listener.core.cluster`), or counts
+this process alone when it runs without the launcher. Readers get the latest
+snapshot without touching the guild cache.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, NamedTuple, NoReturn, Optional
+
+
+class StatsSnapshot(NamedTuple):
+    """Counts over every running cluster at `taken` (a UNIX timestamp)."""
+
+    guilds: int
+    users: int
+    voice_clients: int
+    shards: int
+    clusters: int
+    latency: Optional[float]
+    taken: float
+    music_players: int = 0
+
+    @classmethod
+    def from_totals(cls, totals: Dict[str, Any]) -> "StatsSnapshot":
+        reports = totals.get("clusters", {}).values()
+        latencies = [r["latency"] for r in reports if r.get("latency") is not None]
+        return cls(
+            guilds=totals.get("guilds", 0),
+            users=totals.get("users", 0),
+            voice_clients=totals.get("voice_clients", 0),
+            shards=totals.get("shards", 0),
+            clusters=len(reports),
+            latency=sum(latencies) / len(latencies) if latencies else None,
+            taken=time.time(),
+            music_players=totals.get("music_players", 0),
+        )
+
+
+class StatsService:
+    """Keeps a periodically refreshed `StatsSnapshot` of the whole bot."""
+
+    def __init__(self, bot, interval: float = 30.0) -> None:
+        self.bot = bot
+        self.interval = interval
+        self._snapshot: Optional[StatsSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> Optional[StatsSnapshot]:
+        """The latest snapshot, or None before the first refresh."""
+        return self._snapshot
+
+    async def refresh(self) -> StatsSnapshot:
+        self._snapshot = StatsSnapshot.from_totals(await self.bot.ipc.totals())
+        return self._snapshot
+
+    async def get(self) -> StatsSnapshot:
+        """Returns the latest snapshot, taking the first one if needed."""
+        if self._snapshot is None:
+            return await self.refresh()
+        return self._snapshot
+
+    async def _run(self) -> NoReturn:
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"[STATS] Error: Unable to refresh the stats snapshot: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> NoReturn:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def close(self) -> NoReturn:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -11,6 +11,7 @@ This cog is designed to be a central hub for common bot functionality that doesn
 """
 
 # -*- coding: utf-8 -*-
+import asyncio
 import datetime
 import getpass
 import math
@@ -19,14 +20,14 @@ import platform
 import random
 from typing import NoReturn
 
+import aiohttp
 import cpuinfo
 import disnake
 import psutil
-import wikipedia
 from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 
-from listener.utils import Commands, Config, Logger, Settings, Strings, Utils
+from listener.utils import Commands, Config, Logger, Utils
 from scripts import blacklist
 
 CONFIG = Config()
@@ -74,9 +75,7 @@ class General(commands.Cog, name="General"):
             The message to be echoed by the bot.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             for item in blacklist.list:
                 if content in item:
                     embed = disnake.Embed(
@@ -109,9 +108,7 @@ class General(commands.Cog, name="General"):
             The content of the embed.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             for item in blacklist.list:
                 if content in item:
                     embed = disnake.Embed(
@@ -130,6 +127,27 @@ class General(commands.Cog, name="General"):
                 f"An error occurred: {str(e)}", ephemeral=True
             )
 
+    async def search_wikipedia(self, searcher: str, lang: str = "en"):
+        """Returns the best matching Wikipedia page with its URL and main image, or None."""
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "generator": "search",
+            "gsrsearch": searcher,
+            "gsrlimit": "1",
+            "prop": "info|pageimages",
+            "inprop": "url",
+            "piprop": "original",
+        }
+        async with self.bot.http_session.get(
+            f"https://{lang}.wikipedia.org/w/api.php", params=params
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        pages = data.get("query", {}).get("pages", [])
+        return pages[0] if pages else None
+
     @commands.slash_command(name="wiki", description="Wikipedia")
     @commands.is_nsfw()
     async def wiki(self, inter: disnake.ApplicationCommandInteraction, searcher: str):
@@ -143,17 +161,19 @@ class General(commands.Cog, name="General"):
             The topic to search for on Wikipedia.
         """
         try:
-            wikipedia.set_lang("en")
-            req = wikipedia.page(searcher)
+            page = await self.search_wikipedia(searcher)
+            if page is None:
+                raise LookupError(searcher)
             wikip = disnake.Embed(
-                title=req.title,
+                title=page["title"],
                 description="Wikipedia search results",
-                url=req.url,
+                url=page["fullurl"],
                 color=0x269926,
             )
-            wikip.set_thumbnail(url=req.images[0])
+            if "original" in page:
+                wikip.set_thumbnail(url=page["original"]["source"])
             await inter.response.send_message(embed=wikip)
-        except wikipedia.exceptions.PageError:
+        except (LookupError, aiohttp.ClientError, asyncio.TimeoutError):
             wikierror = disnake.Embed(
                 title="Wikipedia Error",
                 description="Page not found or some other error",
@@ -184,9 +204,7 @@ class General(commands.Cog, name="General"):
         """
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             path = "scripts/version.txt"
             try:
                 with open(path, "r") as file:
@@ -196,8 +214,9 @@ class General(commands.Cog, name="General"):
             ramUsage = self.process.memory_full_info().rss / 1024**2
             pythonVersion = platform.python_version()
             dpyVersion = disnake.__version__
-            servercount = len(self.bot.guilds)
-            usercount = len(self.bot.users)
+            stats = await self.bot.stats.get()
+            servercount = stats.guilds
+            usercount = stats.users
             delta_uptime = datetime.datetime.utcnow() - self.bot.launch_time
             hours, remainder = divmod(int(delta_uptime.total_seconds()), 3600)
             minutes, seconds = divmod(remainder, 60)
@@ -260,9 +279,7 @@ class General(commands.Cog, name="General"):
         Shows the privacy policy of the bot.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             embed = disnake.Embed(
                 title=STRINGS["privacy"]["privtitle"],
                 description=STRINGS["privacy"]["privdesc"],
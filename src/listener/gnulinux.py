@@ -19,7 +19,7 @@ import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 
-from listener.utils import Config, Logger, Settings, Strings
+from listener.utils import Config, Logger
 
 CONFIG = Config()
 
@@ -53,9 +53,7 @@ class GNULinux(commands.Cog):
             If the bot doesn't have permission to send messages in the channel.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             archl = disnake.Embed(
                 title="Arch Linux",
                 url="https://www.archlinux.org/download/",
@@ -94,9 +92,7 @@ class GNULinux(commands.Cog):
             If the bot doesn't have permission to send messages in the channel.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             ubuntu1 = disnake.Embed(
                 title="Ubuntu",
                 url="https://ubuntu.com/",
@@ -133,9 +129,7 @@ class GNULinux(commands.Cog):
             If the bot doesn't have permission to send messages in the channel.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             debian1 = disnake.Embed(
                 title="Debian",
                 url="https://www.debian.org/",
@@ -174,9 +168,7 @@ class GNULinux(commands.Cog):
             If the bot doesn't have permission to send messages in the channel.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             deepin1 = disnake.Embed(
                 title="Deepin",
                 url="https://www.deepin.org",
@@ -215,9 +207,7 @@ class GNULinux(commands.Cog):
             If the bot doesn't have permission to send messages in the channel.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             manjaro1 = disnake.Embed(
                 title="Manjaro",
                 url="https://manjaro.org/",
@@ -256,9 +246,7 @@ class GNULinux(commands.Cog):
             If the bot doesn't have permission to send messages in the channel.
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             mint1 = disnake.Embed(
                 title="Linux Mint",
                 url="https://linuxmint.com/",
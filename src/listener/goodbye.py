@@ -12,7 +12,6 @@ The `on_member_remove` event listener is responsible for sending the goodbye mes
 
 import asyncio
 import functools
-import sqlite3
 from datetime import datetime
 
 import disnake
@@ -20,6 +19,8 @@ from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 from termcolor import cprint
 
+from listener.core.events import events as event_log
+from listener.core.logsink import sink as log_sink
 from scripts import db
 
 
@@ -31,7 +32,6 @@ class Goodbye(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        logpath = "logs/log.txt"
         cprint(
             f"""
         ║============================================================║
@@ -39,20 +39,13 @@ class Goodbye(commands.Cog):
         ║============================================================║
         """
         )
-        with open(logpath, "a", encoding="utf-8") as file:
-            print("\n", file=file)
-            print(f"{member} left {member.guild.name}", file=file)
-
-        connect = sqlite3.connect(db.main)
-        cursor = connect.cursor()
-        cursor.execute(
-            db.select_table("goodbye", "channel_id", "guild_id", member.guild.id)
-        )
-        chan = cursor.fetchone()
-        if chan is None:
+        log_sink.write(f"{member} left {member.guild.name}")
+        event_log.emit("member_remove", guild_id=member.guild.id, user_id=member.id)
+
+        config = await db.goodbye_config.get(member.guild.id)
+        if config is None or config[0] is None:
             return
-        cursor.execute(db.select_table("goodbye", "text", "guild_id", member.guild.id))
-        desc = cursor.fetchone()
+        chan, desc = config
         descdef = f"The one who left was {member}, who knows his/hers reasons for leaving but we will welcome them with open arms if they return "
         gb = disnake.Embed(
             title="User left the server",
@@ -63,10 +56,8 @@ class Goodbye(commands.Cog):
         if desc is None:
             gb.add_field(name="Server message", value=f"{descdef}", inline=True)
         else:
-            gb.add_field(name="Server message", value=f"{desc[0]}", inline=True)
-        channel = self.bot.get_channel(int(chan[0]))
-        cursor.close()
-        connect.close()
+            gb.add_field(name="Server message", value=f"{desc}", inline=True)
+        channel = self.bot.get_channel(int(chan))
         await channel.send(embed=gb)
 
     @commands.slash_command(name="goodbye", description="Help")
@@ -117,30 +108,11 @@ class Goodbye(commands.Cog):
             return
 
         try:
-            connect = sqlite3.connect(db.main)
-            cursor = connect.cursor()
-            cursor.execute(
-                db.select_table("goodbye", "channel_id", "guild_id", inter.guild.id)
+            val = (inter.guild.id, channel.id)
+            await db.pool.execute(
+                db.upsert_table("goodbye", "guild_id", "channel_id"), val
             )
-            result = cursor.fetchone()
-            if result is None:
-                val = (inter.guild.id, channel.id)
-                cursor.execute(
-                    db.insert_table("goodbye", "guild_id", "channel_id"), val
-                )
-            else:
-                cursor.execute(
-                    db.update_table(
-                        "goodbye",
-                        "channel_id",
-                        channel.id,
-                        "guild_id",
-                        inter.guild.id,
-                    )
-                )
-            connect.commit()
-            cursor.close()
-            connect.close()
+            db.goodbye_config.invalidate(inter.guild.id)
             await inter.response.send_message(
                 f"Set the goodbye channel in {inter.guild} to {channel.mention}",
                 ephemeral=True,
@@ -163,24 +135,18 @@ class Goodbye(commands.Cog):
             return
 
         try:
-            connect = sqlite3.connect(db.main)
-            cursor = connect.cursor()
-            cursor.execute(
-                db.select_table("goodbye", "channel_id", "guild_id", inter.guild.id)
+            deleted = await db.pool.execute(
+                db.delete_table("goodbye", "guild_id"), (inter.guild.id,)
             )
-            result = cursor.fetchone()
-            if result is None:
+            db.goodbye_config.invalidate(inter.guild.id)
+            if not deleted:
                 await inter.response.send_message(
                     "No goodbye channel is set for this server.", ephemeral=True
                 )
             else:
-                cursor.execute(db.delete_table("goodbye", "guild_id", inter.guild.id))
                 await inter.response.send_message(
                     "Cleared the goodbye channel setting", ephemeral=True
                 )
-            connect.commit()
-            cursor.close()
-            connect.close()
         except Exception as e:
             await inter.response.send_message(
                 f"Failed to remove goodbye channel setting: {str(e)}", ephemeral=True
@@ -210,21 +176,11 @@ class Goodbye(commands.Cog):
                     "Setting default message", ephemeral=True
                 )
 
-            connect = sqlite3.connect(db.main)
-            cursor = connect.cursor()
-            cursor.execute(
-                db.select_table("goodbye", "text", "guild_id", inter.guild.id)
+            val = (inter.guild.id, content)
+            await db.pool.execute(
+                db.upsert_table("goodbye", "guild_id", "text"), val
             )
-            res = cursor.fetchone()
-            if res is None:
-                val = (inter.guild.id, content)
-                cursor.execute(db.insert_table("goodbye", "guild_id", "text"), val)
-            else:
-                val = (content, inter.guild.id)
-                cursor.execute("UPDATE goodbye SET text = ? WHERE guild_id = ?", val)
-            connect.commit()
-            cursor.close()
-            connect.close()
+            db.goodbye_config.invalidate(inter.guild.id)
             await inter.response.send_message(
                 "Set the goodbye message text", ephemeral=True
             )
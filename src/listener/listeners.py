@@ -4,7 +4,7 @@ The `Listeners` class is a Disnake extension that handles various events that oc
 
 The `on_guild_join` event listener sends a welcome message to the first channel in the guild where the bot has permission to send messages. The message includes information about the bot, such as its version and the invite link for the guild.
 
-The `on_command` event listener logs information about commands that are used, including the user who used the command and the guild where it was used.
+The `on_command` event listener logs information about commands that are used, including the user who used the command and the guild where it was used. Prefix and slash commands, errors and guild joins are also recorded as structured records in the JSON event log.
 
 The `on_message` event listener checks if the bot was mentioned in a message, and if so, it sends a message with the bot's prefix.
 
@@ -14,7 +14,6 @@ The `on_command_error` event listener handles various types of errors that can o
 # -*- coding: utf-8 -*-
 import asyncio
 import datetime
-import os
 import traceback
 from types import TracebackType
 from typing import NoReturn, Union
@@ -25,6 +24,8 @@ from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 from termcolor import cprint
 
+from listener.core.events import events as event_log
+from listener.core.logsink import sink as log_sink
 from listener.utils import Commands, Config, Logger, Settings, Strings, Utils
 
 CONFIG = Config()
@@ -36,25 +37,14 @@ class Listeners(commands.Cog, name="Listeners"):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
         self.name = "Listeners"
-        self.logpath = "logs/log.txt"
-        self._ensure_log_file_exists()
-
-    def _ensure_log_file_exists(self):
-        """ """
-        os.makedirs(os.path.dirname(self.logpath), exist_ok=True)
-        if not os.path.exists(self.logpath):
-            with open(self.logpath, "a", encoding="utf-8") as file:
-                pass
 
     def _log_to_file(self, message: str):
-        """
+        """Queues a line for the buffered log sink.
 
         :param message: str:
 
         """
-        with open(self.logpath, "a", encoding="utf-8") as file:
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            file.write(f"[{timestamp}] {message}\n")
+        log_sink.write(message)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: Guild) -> NoReturn:
@@ -97,6 +87,7 @@ class Listeners(commands.Cog, name="Listeners"):
         print(f"{invite}")
         self._log_to_file(f"Bot has been added to: {guild}")
         self._log_to_file(f"The invite for this server is: {invite}")
+        event_log.emit("guild_join", guild_id=guild.id, name=guild.name)
         for channel in guild.text_channels:
             if channel.permissions_for(guild.me).send_messages:
                 await channel.send(embed=embed)
@@ -109,6 +100,26 @@ class Listeners(commands.Cog, name="Listeners"):
         self._log_to_file(
             f"Command used: {ctx.command.name} by {ctx.message.author} in {ctx.message.guild}"
         )
+        event_log.emit(
+            "command",
+            guild_id=ctx.guild.id if ctx.guild else None,
+            user_id=ctx.author.id,
+            command=ctx.command.qualified_name,
+            source="prefix",
+        )
+
+    @commands.Cog.listener()
+    async def on_slash_command(
+        self, inter: disnake.ApplicationCommandInteraction
+    ) -> NoReturn:
+        """Recording slash commands in the event log."""
+        event_log.emit(
+            "command",
+            guild_id=inter.guild_id,
+            user_id=inter.author.id,
+            command=inter.application_command.qualified_name,
+            source="slash",
+        )
 
     @commands.Cog.listener()
     async def on_message(self, message: Message) -> NoReturn:
@@ -184,6 +195,13 @@ class Listeners(commands.Cog, name="Listeners"):
             cprint(error_message, color="red")
             cprint("==============================")
             self._log_to_file(error_message)
+            event_log.emit(
+                "error",
+                guild_id=ctx_or_inter.guild.id if ctx_or_inter.guild else None,
+                user_id=ctx_or_inter.author.id,
+                command=command_name,
+                error=f"{type(error).__name__}: {error}",
+            )
 
             if isinstance(error, commands.CommandNotFound):
                 return
@@ -16,7 +16,7 @@ import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 
-from listener.utils import Config, Logger, Settings, Strings
+from listener.utils import Config, Logger
 from scripts import games
 
 CONFIG = Config()
@@ -43,9 +43,7 @@ class Minigames(commands.Cog):
         None
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             kuboid = random.choice(games.kubik)
             embedkub = disnake.Embed(
                 title=STRINGS["other"]["rollcubetitle"], color=0x00FF00
@@ -77,9 +75,7 @@ class Minigames(commands.Cog):
         None
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             mon = random.choice(games.monet)
             embedmonet = disnake.Embed(
                 title=STRINGS["other"]["cointosstitle"], color=0x00FF00
@@ -112,9 +108,7 @@ class Minigames(commands.Cog):
         None
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             kasino1 = random.choice(games.casin_obj1)
             kasino2 = random.choice(games.casin_obj2)
             kasino3 = random.choice(games.casin_obj3)
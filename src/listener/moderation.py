@@ -8,7 +8,7 @@ from disnake.ext.commands import Bot, Context, Greedy
 from disnake.ext.commands.params import Param
 from termcolor import cprint
 
-from listener.utils import Config, Logger, Settings, Strings, Utils
+from listener.utils import Config, Logger, Utils
 
 CONFIG = Config()
 
@@ -31,9 +31,7 @@ class Moderation(commands.Cog, name="Moderation"):
         reason: str = Param(description="Ban reason", default="N/A"),
     ) -> NoReturn:
         await inter.response.defer()
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         try:
             if not member.bot:
@@ -76,9 +74,7 @@ class Moderation(commands.Cog, name="Moderation"):
         member: str = Param(description="User to unban"),
     ) -> NoReturn:
         await inter.response.defer()
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         try:
             if "#" in member:
@@ -133,9 +129,7 @@ class Moderation(commands.Cog, name="Moderation"):
         reason: str = Param(description="Ban reason", default="N/A"),
     ) -> NoReturn:
         await inter.response.defer()
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
         not_banned_members = []
 
         member_list = [member.strip() for member in members.split(",")]
@@ -177,9 +171,7 @@ class Moderation(commands.Cog, name="Moderation"):
         reason: str = Param(description="Kick reason", default="N/A"),
     ) -> NoReturn:
         await inter.response.defer()
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         try:
             if not member.bot:
@@ -214,9 +206,7 @@ class Moderation(commands.Cog, name="Moderation"):
         inter: disnake.ApplicationCommandInteraction,
         number: int = Param(description="Number of messages"),
     ) -> NoReturn:
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         await inter.response.defer()
 
@@ -249,9 +239,7 @@ class Moderation(commands.Cog, name="Moderation"):
         name: str = Param(description="New nickname"),
     ) -> NoReturn:
         await inter.response.defer()
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         if len(name) > 32:
             embed = Utils.error_embed(STRINGS["error"]["too_long_name"])
@@ -284,9 +272,7 @@ class Moderation(commands.Cog, name="Moderation"):
         reason: str = Param(description="Mute reason", default="N/A"),
     ) -> NoReturn:
         await inter.response.defer()
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         if member.is_timed_out():
             embed = Utils.error_embed(STRINGS["error"]["already_muted"])
@@ -317,9 +303,7 @@ class Moderation(commands.Cog, name="Moderation"):
         member: Member = Param(description="User to unmute"),
         reason: str = Param(description="Unmute reason", default="N/A"),
     ) -> NoReturn:
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         await inter.response.defer()
 
@@ -366,9 +350,7 @@ class Moderation(commands.Cog, name="Moderation"):
     ):
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             for channel in inter.guild.channels:
                 await channel.set_permissions(role, send_messages=False)
             embed = disnake.Embed(
@@ -393,9 +375,7 @@ class Moderation(commands.Cog, name="Moderation"):
     ):
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             for channel in inter.guild.channels:
                 await channel.set_permissions(role, send_messages=True)
             embed = disnake.Embed(
@@ -417,9 +397,7 @@ class Moderation(commands.Cog, name="Moderation"):
     async def lockdown(self, inter: disnake.ApplicationCommandInteraction):
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             for channel in inter.guild.channels:
                 await channel.set_permissions(inter.guild.default_role, send_messages=False)
             embed = disnake.Embed(
@@ -440,9 +418,7 @@ class Moderation(commands.Cog, name="Moderation"):
     async def unlock(self, inter: disnake.ApplicationCommandInteraction):
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             for channel in inter.guild.channels:
                 await channel.set_permissions(inter.guild.default_role, send_messages=True)
             embed = disnake.Embed(
@@ -464,9 +440,7 @@ class Moderation(commands.Cog, name="Moderation"):
     async def channellock(self, inter: disnake.ApplicationCommandInteraction):
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             await inter.channel.set_permissions(
                 inter.guild.default_role, send_messages=False
             )
@@ -489,9 +463,7 @@ class Moderation(commands.Cog, name="Moderation"):
     async def channelunlock(self, inter: disnake.ApplicationCommandInteraction):
         await inter.response.defer()
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             await inter.channel.set_permissions(
                 inter.guild.default_role, send_messages=True
             )
@@ -2,12 +2,17 @@ import asyncio
 import random
 import re
 import typing as t
+from collections import deque
 from enum import Enum
+from itertools import islice
 
 import disnake
 import wavelink
 from disnake.ext import commands
 
+from listener.core.music.cache import TrackCache
+from listener.core.music.nodes import NodePool
+from listener.core.music.reaper import PlayerReaper
 from listener.utils import Config, Logger, Settings, Strings
 
 CONFIG = Config()
@@ -89,45 +94,66 @@ class RepeatMode(Enum):
 
 
 class Queue:
-    """ """
+    """Tracks of one player, split into history, the current track and upcoming.
+
+    Advancing moves one track from `upcoming` to `history`, which only keeps
+    the last `history_limit` tracks, so 24/7 sessions do not grow forever.
+    With `RepeatMode.ALL` the history is kept whole instead, since the queue
+    starts over from it.
+    """
 
-    def __init__(self):
-        self._queue = []
-        self.position = 0
+    def __init__(self, history_limit=None):
+        self.history_limit = (
+            CONFIG.get("music_history_limit", 50)
+            if history_limit is None
+            else history_limit
+        )
+        self._history = deque()
+        self._current = None
+        self._upcoming = deque()
         self.repeat_mode = RepeatMode.NONE
 
     @property
     def is_empty(self):
         """ """
-        return not self._queue
+        return self._current is None and not self._upcoming and not self._history
 
     @property
     def current_track(self):
         """ """
-        if not self._queue:
+        if self.is_empty:
             raise QueueIsEmpty
-
-        if self.position <= len(self._queue) - 1:
-            return self._queue[self.position]
+        return self._current
 
     @property
     def upcoming(self):
-        """ """
-        if not self._queue:
+        """A copy of the upcoming tracks, use `upcoming_page` for a part of them."""
+        if self.is_empty:
             raise QueueIsEmpty
-        return self._queue[self.position + 1 :]
+        return list(self._upcoming)
 
     @property
     def history(self):
         """ """
-        if not self._queue:
+        if self.is_empty:
             raise QueueIsEmpty
-        return self._queue[: self.position]
+        return list(self._history)
+
+    @property
+    def position(self):
+        """Index of the current track among all tracks still kept."""
+        return len(self._history)
 
     @property
     def length(self):
         """ """
-        return len(self._queue)
+        return len(self._history) + (self._current is not None) + len(self._upcoming)
+
+    def upcoming_page(self, page, per_page=10):
+        """Returns the upcoming tracks on `page` (from 0) and the number of pages."""
+        pages = max(1, -(-len(self._upcoming) // per_page))
+        start = min(max(page, 0), pages - 1) * per_page
+        return list(islice(self._upcoming, start, start + per_page)), pages
 
     def add(self, *args):
         """
@@ -135,30 +161,40 @@ class Queue:
         :param *args:
 
         """
-        self._queue.extend(args)
+        tracks = iter(args)
+        if self._current is None:
+            # Nothing playing (a new or finished queue), the first new track is next.
+            self._current = next(tracks, None)
+        self._upcoming.extend(tracks)
+
+    def _retire(self, track):
+        self._history.append(track)
+        if self.repeat_mode != RepeatMode.ALL:
+            while len(self._history) > self.history_limit:
+                self._history.popleft()
 
     def get_next_track(self):
         """ """
-        if not self._queue:
+        if self.is_empty:
             raise QueueIsEmpty
-        self.position += 1
-        if self.position < 0:
-            return None
-        elif self.position > len(self._queue) - 1:
-            if self.repeat_mode == RepeatMode.ALL:
-                self.position = 0
-            else:
+        if self._current is not None:
+            self._retire(self._current)
+            self._current = None
+        if not self._upcoming:
+            if self.repeat_mode != RepeatMode.ALL:
                 return None
-        return self._queue[self.position]
+            # Start over: everything played becomes upcoming again.
+            self._upcoming, self._history = self._history, deque()
+        self._current = self._upcoming.popleft()
+        return self._current
 
     def shuffle(self):
         """ """
-        if not self._queue:
+        if self.is_empty:
             raise QueueIsEmpty
-        upcoming = self.upcoming
+        upcoming = list(self._upcoming)
         random.shuffle(upcoming)
-        self._queue = self._queue[: self.position + 1]
-        self._queue.extend(upcoming)
+        self._upcoming = deque(upcoming)
 
     def set_repeat_mode(self, mode):
         """
@@ -172,11 +208,37 @@ class Queue:
             self.repeat_mode = RepeatMode.ONE
         elif mode == "entirequeue":
             self.repeat_mode = RepeatMode.ALL
+        while len(self._history) > self.history_limit and self.repeat_mode != RepeatMode.ALL:
+            self._history.popleft()
 
     def empty(self):
         """ """
-        self._queue.clear()
-        self.position = 0
+        self._history.clear()
+        self._current = None
+        self._upcoming.clear()
+
+    def export(self):
+        """Plain-data copy of the queue that survives a reload of this module."""
+        tracks = list(self._history)
+        if self._current is not None:
+            tracks.append(self._current)
+        tracks.extend(self._upcoming)
+        return {
+            "tracks": tracks,
+            "position": len(self._history),
+            "repeat_mode": self.repeat_mode.name,
+        }
+
+    @classmethod
+    def from_export(cls, state):
+        queue = cls()
+        tracks, position = state["tracks"], state["position"]
+        queue.repeat_mode = RepeatMode[state["repeat_mode"]]
+        queue._history = deque(tracks[:position])
+        if position < len(tracks):
+            queue._current = tracks[position]
+            queue._upcoming = deque(tracks[position + 1 :])
+        return queue
 
 
 class Player(wavelink.Player):
@@ -274,17 +336,97 @@ class Music(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.wavelink = wavelink.Client(bot=bot)
-        self.bot.loop.create_task(self.start_nodes())
+        # A new client would drop the nodes and players of the current one, so
+        # reloads of this cog keep using the client stored on the bot.
+        if getattr(bot, "wavelink", None) is None:
+            bot.wavelink = wavelink.Client(bot=bot)
+        self.wavelink = bot.wavelink
+        # Connects the configured nodes that are not connected yet, then
+        # watches them and moves players off any node that goes down.
+        self.nodes = NodePool(
+            self.wavelink,
+            CONFIG.get("lavalink_nodes"),
+            CONFIG.get("lavalink_check_interval", 10),
+            hook=self.on_node_event,
+        )
+        self.nodes.start(bot)
+        # Shared by every guild, so a song resolved once is not looked up again.
+        options = CONFIG.get("track_cache", {})
+        self.tracks = TrackCache(
+            self.nodes.get_tracks,
+            ttl=options.get("ttl", 600),
+            empty_ttl=options.get("empty_ttl", 30),
+            max_entries=options.get("max_entries", 2048),
+        )
+        options = CONFIG.get("music_reaper", {})
+        self.reaper = PlayerReaper(
+            bot,
+            self.wavelink,
+            interval=options.get("interval", 30),
+            idle_timeout=options.get("idle_timeout", 300),
+            empty_timeout=options.get("empty_timeout", 60),
+        )
+        self.reaper.start()
+        # Leave voice channels while the gateway is still connected.
+        bot.shutdown.register("music", self.close_players, order=10)
+
+    def cog_unload(self):
+        self.bot.shutdown.unregister("music")
+        self.nodes.close()
+        self.reaper.close()
+
+    def cog_export_state(self):
+        return {
+            "queues": {
+                guild_id: player.queue.export()
+                for guild_id, player in self.wavelink.players.items()
+            },
+            "tracks": self.tracks.export(),
+            "reaper": self.reaper.export(),
+        }
+
+    def cog_import_state(self, state):
+        queues = state["queues"]
+        for guild_id, player in self.wavelink.players.items():
+            # Running players are instances of the old classes; move them to
+            # the reloaded ones so they pick up the new code.
+            player.__class__ = Player
+            if guild_id in queues:
+                player.queue = Queue.from_export(queues[guild_id])
+        # Without this a reload would look every song up on the nodes again.
+        self.tracks.load(state["tracks"])
+        # Keeps the /debug totals and lets running countdowns continue.
+        self.reaper.load(state["reaper"])
+
+    async def close_players(self):
+        """Disconnects every player and frees it on its Lavalink node."""
+        players = list(self.wavelink.players.values())
+        await asyncio.gather(
+            *(player.teardown() for player in players), return_exceptions=True
+        )
+        print(f"[MUSIC] Closed {len(players)} player(s)")
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
-        if (
-            not member.bot
-            and after.channel is None
-            and not [m for m in before.channel.members if not m.bot]
-        ):
-            await self.get_player(member.guild).teardown()
+        if member.bot or before.channel is None or before.channel == after.channel:
+            return
+        player = self.wavelink.players.get(member.guild.id)
+        if player is None or player.channel_id is None:
+            return
+        if int(player.channel_id) == before.channel.id and not [
+            m for m in before.channel.members if not m.bot
+        ]:
+            # The reaper leaves once the channel stayed empty for a while.
+            self.reaper.mark_empty(member.guild.id)
+
+    async def on_node_event(self, event):
+        """Hook of every Lavalink node, passes finished tracks on to the queue."""
+        if not isinstance(event, wavelink.TrackEnd):
+            return
+        try:
+            await self.on_wavelink_track_end(event.player, event.track, event.reason)
+        except Exception as e:
+            print(f"[MUSIC] Error: Unable to advance player {event.player.guild_id}: {e}")
 
     @commands.Cog.listener()
     async def on_wavelink_track_end(
@@ -295,33 +437,25 @@ class Music(commands.Cog):
         else:
             await player.advance()
 
-    async def start_nodes(self):
-        await self.bot.wait_until_ready()
-
-        nodes = {
-            "MAIN": {
-                "host": "n17.danbot.host",
-                "port": 1679,
-                "rest_uri": "http://n17.danbot.host:1679",
-                "password": "DBH",
-                "identifier": "MAIN",
-                "region": "europe",
-            }
-        }
-
-        for node in nodes.values():
-            await self.wavelink.initiate_node(**node)
-
     def get_player(self, obj):
         """
 
         :param obj:
 
         """
-        if isinstance(obj, commands.Context):
-            return self.wavelink.get_player(obj.guild.id, cls=Player, context=obj)
-        elif isinstance(obj, disnake.Guild):
-            return self.wavelink.get_player(obj.id, cls=Player)
+        if isinstance(obj, disnake.Guild):
+            guild, kwargs = obj, {}
+        elif isinstance(obj, (commands.Context, disnake.Interaction)):
+            guild, kwargs = obj.guild, {"context": obj}
+        else:
+            return None
+
+        if guild.id not in self.wavelink.players:
+            # New players go to the least loaded node.
+            node = self.nodes.best()
+            if node is not None:
+                kwargs["node_id"] = node.identifier
+        return self.wavelink.get_player(guild.id, cls=Player, **kwargs)
 
     @commands.slash_command(name="join", description="Join")
     async def join(self, inter: disnake.ApplicationCommandInteraction):
@@ -347,7 +481,7 @@ class Music(commands.Cog):
         if not re.match(URL_REGEX, query):
             query = f"ytsearch:{query}"
 
-        await player.add_tracks(inter, await self.wavelink.get_tracks(query))
+        await player.add_tracks(inter, await self.tracks.get(query))
         await inter.response.send_message(f"Added to queue: {query}")
 
     @commands.slash_command(name="pause", description="Pause")
@@ -376,26 +510,32 @@ class Music(commands.Cog):
         await inter.response.send_message("Skipped the current song")
 
     @commands.slash_command(name="queue", description="Queue")
-    async def queue(self, inter: disnake.ApplicationCommandInteraction):
+    async def queue(self, inter: disnake.ApplicationCommandInteraction, page: int = 1):
         player = self.get_player(inter)
         if player.queue.is_empty:
             raise QueueIsEmpty
 
         embed = disnake.Embed(title="Queue", color=disnake.Color.blurple())
+        current = player.queue.current_track
         embed.add_field(
             name="Currently playing",
-            value=player.queue.current_track.title,
+            value=current.title if current is not None else "Nothing",
             inline=False,
         )
 
-        if upcoming := player.queue.upcoming:
+        per_page = 10
+        upcoming, pages = player.queue.upcoming_page(page - 1, per_page)
+        if upcoming:
+            page = min(max(page, 1), pages)
             embed.add_field(
                 name="Next up",
                 value="\n".join(
-                    f"**{i+1}.** {t.title}" for i, t in enumerate(upcoming[:10])
+                    f"**{(page - 1) * per_page + i + 1}.** {t.title}"
+                    for i, t in enumerate(upcoming)
                 ),
                 inline=False,
             )
+            embed.set_footer(text=f"Page {page}/{pages}")
 
         await inter.response.send_message(embed=embed)
 
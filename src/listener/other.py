@@ -6,7 +6,7 @@ import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 
-from listener.utils import Config, Logger, Settings, Strings, Utils
+from listener.utils import Config, Logger, Utils
 from scripts import desAnime, desNature, desStarwars
 
 CONFIG = Config()
@@ -33,9 +33,7 @@ class Other(commands.Cog, name="Other"):
         """
         try:
             EMBED_COLOR = 0xFF8000
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             latency = "%.0fms" % (self.bot.latency * 100)
             embed = disnake.Embed(
                 title=f"{self.bot.name} Latency",
@@ -73,9 +71,7 @@ class Other(commands.Cog, name="Other"):
         NoReturn
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             wallinfo = disnake.Embed(
                 title=STRINGS["wallpaper"]["wallpaperembedtitle"],
                 description=STRINGS["wallpaper"]["wallpaperdesc"],
@@ -118,9 +114,7 @@ class Other(commands.Cog, name="Other"):
         NoReturn
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             embedanime = disnake.Embed(
                 title=STRINGS["wallpaper"]["wallpaperanimetitle"],
                 color=0x00FF00,
@@ -148,9 +142,7 @@ class Other(commands.Cog, name="Other"):
         NoReturn
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             imgnat = random.choice(desNature.images)
             embednat = disnake.Embed(
                 title=STRINGS["wallpaper"]["wallpapernaturetitle"],
@@ -180,9 +172,7 @@ class Other(commands.Cog, name="Other"):
         NoReturn
         """
         try:
-            s = await Settings(inter.guild.id)
-            lang = await s.get_field("locale", CONFIG["default_locale"])
-            STRINGS = Strings(lang)
+            STRINGS = inter.strings
             imgstarwars = random.choice(desStarwars.images)
             embedstarwars = disnake.Embed(
                 title=STRINGS["wallpaper"]["wallpaperstarwarstitle"],
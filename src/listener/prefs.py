@@ -5,7 +5,7 @@ import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 
-from listener.utils import Config, Logger, Settings, Strings, Utils
+from listener.utils import Config, Logger, Settings, Utils
 
 CONFIG = Config()
 
@@ -29,6 +29,7 @@ class Preferences(commands.Cog, name="Preferences"):
         """
         s = await Settings(inter.guild.id)
         await s.set_field("prefix", prefix)
+        self.bot.prefix_cache.invalidate(inter.guild.id)
         embed = disnake.Embed(title=f"Prefix has been set to {prefix}", color=0x0C0C0C)
         await inter.response.send_message(embed=embed, ephemeral=True)
 
@@ -47,8 +48,7 @@ class Preferences(commands.Cog, name="Preferences"):
         locale: The new locale to set
         """
         s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
         locales = Utils.get_locales_list()
 
         for _locale in locales:
@@ -9,7 +9,7 @@ import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Bot
 
-from listener.utils import Config, Logger, Settings, Strings
+from listener.utils import Config, Logger
 
 CONFIG = Config()
 
@@ -28,9 +28,7 @@ class Utilities(commands.Cog):
         -----------
         member: The user to show information about. If not provided, shows information about the command user.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         member = member or inter.author
 
@@ -55,9 +53,7 @@ class Utilities(commands.Cog):
         -----------
         emoji: The emoji to show information about.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         try:
             format = "png" if re.sub(r"[\<]", "", emoji.split(":")[0]) == "" else "gif"
@@ -83,9 +79,7 @@ class Utilities(commands.Cog):
         -----------
         channel: The channel to show information about.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         channel_type = STRINGS["etc"]["channel_type"]["text"]
         if isinstance(channel, disnake.VoiceChannel):
@@ -112,9 +106,7 @@ class Utilities(commands.Cog):
         -----------
         member: The user whose avatar to show. If not provided, shows the command user's avatar.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         member = member or inter.author
         avatar = member.avatar.url
@@ -138,9 +130,7 @@ class Utilities(commands.Cog):
         min_value: The minimum value for the random number.
         max_value: The maximum value for the random number.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         if min_value > max_value:
             min_value, max_value = max_value, min_value
@@ -164,9 +154,7 @@ class Utilities(commands.Cog):
         -----------
         num: The number to calculate the square root of.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         if num < 0:
             embed = disnake.Embed(
@@ -200,9 +188,7 @@ class Utilities(commands.Cog):
         -----------
         guild_id: The ID of the guild to show information about. If not provided, shows information about the current guild.
         """
-        s = await Settings(inter.guild.id)
-        lang = await s.get_field("locale", CONFIG["default_locale"])
-        STRINGS = Strings(lang)
+        STRINGS = inter.strings
 
         if guild_id is not None and await self.bot.is_owner(inter.author):
             guild = self.bot.get_guild(guild_id)
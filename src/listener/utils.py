@@ -3,11 +3,11 @@ Provides utility functions and classes for the Discord bot.
 
 The `Config` class loads the bot's configuration from a JSON file.
 
-The `Commands` class provides a way to load command translations from locale-specific JSON files.
+The `Commands` class provides a way to load command translations from locale-specific JSON files. The translations are served from the preloaded, read-only locale catalog.
 
-The `Settings` class manages the bot's settings, which are stored in a JSON file. It provides methods to create, retrieve, and update settings fields.
+The `Settings` class manages the bot's settings, which are stored one row per guild and field in the bot database. It provides methods to create, retrieve, and update settings fields. Reads and writes go through the process-wide `SettingsStore`, which caches each guild in memory and persists changes in batches.
 
-The `Strings` class provides a way to load locale-specific strings from JSON files.
+The `Strings` class provides a way to load locale-specific strings from JSON files. Like `Commands`, it returns a read-only mapping from the locale catalog that is loaded once at startup.
 
 The `Logger` class provides logging functions to print messages with different levels of severity.
 
@@ -17,17 +17,18 @@ The `Utils` class is a Discord command extension that provides utility functions
 # -*- coding: utf-8 -*-
 import datetime
 import json
-import os
 from os.path import abspath, dirname
-from typing import Any, AnyStr, Dict, List, NoReturn
+from typing import Any, AnyStr, Dict, List, Mapping, NoReturn
 
-from aiofile import async_open
 from asyncinit import asyncinit
 from disnake import Embed, Message
 from disnake.ext import commands
 from disnake.ext.commands import Bot
 from termcolor import cprint
 
+from listener.core.locales import catalog as locale_catalog
+from listener.core.settings import store as settings_store
+
 
 class Config:
     cfg = None
@@ -38,31 +39,12 @@ class Config:
 
 
 CONFIG = Config()
+locale_catalog.load(CONFIG["default_locale"])
 
 
 class Commands:
-    def __listdirs(path: AnyStr) -> List[str]:
-        return [d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))]
-
-    def __new__(self, locale: AnyStr = "") -> Dict:
-        dirs = self.__listdirs(dirname(abspath(__file__)) + "/../data/locales/")
-
-        if locale in dirs or locale != "":
-            with open(
-                dirname(abspath(__file__)) + f"/../data/locales/{locale}/commands.json",
-                "r",
-                encoding="utf-8",
-            ) as f:
-                return json.load(f)
-        else:
-            CONFIG = Config()
-            with open(
-                dirname(abspath(__file__))
-                + f'/../data/locales/{CONFIG["default_locale"]}/commands.json',
-                "r",
-                encoding="utf-8",
-            ) as f:
-                return json.load(f)
+    def __new__(self, locale: AnyStr = "") -> Mapping:
+        return locale_catalog.get("commands", locale)
 
 
 @asyncinit
@@ -72,77 +54,29 @@ class Settings:
 
     async def __init__(self, _guild_id: int) -> None:
         self.guild_id = _guild_id
-
-        async with async_open(
-            dirname(abspath(__file__)) + "/../data/settings.json", "r"
-        ) as f:
-            self.settings = json.loads(await f.read())
-
-    async def __save(self) -> NoReturn:
-        async with async_open(
-            dirname(abspath(__file__)) + "/../data/settings.json", "w"
-        ) as f:
-            await f.write(json.dumps(self.settings, indent=4))
-
-    async def __create_guild_object(self) -> NoReturn:
-        self.settings[str(str(self.guild_id))] = {}
-        await self.__save()
+        self.settings = settings_store.guild(_guild_id)
 
     async def create_empty_field(self, field: AnyStr) -> NoReturn:
-        try:
-            self.settings[str(self.guild_id)][field] = None
-            await self.__save()
-        except:
-            await self.__create_guild_object()
-            self.settings[str(self.guild_id)][field] = None
-            await self.__save()
+        settings_store.set(self.guild_id, field, None)
 
     async def get_field(self, field: AnyStr, default_value: Any = None) -> Any:
-        try:
-            val = self.settings[str(self.guild_id)][field]
-        except:
+        if field not in self.settings:
             await self.create_empty_field(field)
-            val = self.settings[str(self.guild_id)][field]
+        val = self.settings[field]
 
         if val is not None or default_value is None:
-            return self.settings[str(self.guild_id)][field]
+            return val
 
         await self.set_field(field, default_value)
         return default_value
 
     async def set_field(self, field: AnyStr, value) -> NoReturn:
-        try:
-            self.settings[str(self.guild_id)][field] = value
-            await self.__save()
-        except:
-            await self.create_empty_field(field)
-            self.settings[str(self.guild_id)][field] = value
-            await self.__save()
+        settings_store.set(self.guild_id, field, value)
 
 
 class Strings:
-    def __listdirs(path: AnyStr) -> List[str]:
-        return [d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))]
-
-    def __new__(self, locale: AnyStr = "") -> Dict:
-        dirs = self.__listdirs(dirname(abspath(__file__)) + "/../data/locales/")
-
-        if locale in dirs or locale != "":
-            with open(
-                dirname(abspath(__file__)) + f"/../data/locales/{locale}/strings.json",
-                "r",
-                encoding="utf-8",
-            ) as f:
-                return json.load(f)
-        else:
-            CONFIG = Config()
-            with open(
-                dirname(abspath(__file__))
-                + f'/../data/locales/{CONFIG["default_locale"]}/strings.json',
-                "r",
-                encoding="utf-8",
-            ) as f:
-                return json.load(f)
+    def __new__(self, locale: AnyStr = "") -> Mapping:
+        return locale_catalog.get("strings", locale)
 
 
 """
@@ -209,15 +143,11 @@ class Utils(commands.Cog, name="Utils"):
         return Embed(color=0xED4242, description=msg)
 
     async def get_prefix(bot: Bot, msg: Message) -> List[str]:
-        s = await Settings(msg.guild.id)
-        prefix = await s.get_field("prefix", CONFIG["default_prefix"])
-        return [bot.user.mention + " ", f"<@!{bot.user.id}> ", prefix, prefix + " "]
+        guild_id = msg.guild.id if msg.guild else None
+        return list(bot.prefix_cache.get(bot.user, guild_id))
 
     def get_locales_list():
-        def __listdirs(path: AnyStr) -> List[str]:
-            return [d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))]
-
-        return __listdirs(dirname(abspath(__file__)) + "/../data/locales/")
+        return locale_catalog.locales()
 
 
 def setup(bot: Bot) -> NoReturn:
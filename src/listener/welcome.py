@@ -1,13 +1,14 @@
 import asyncio
 import functools
 import os
-import sqlite3
 
 import disnake
 from disnake.ext import commands
 from disnake.ext.commands import Bot, Context
 from termcolor import cprint
 
+from listener.core.events import events as event_log
+from listener.core.logsink import sink as log_sink
 from scripts import db
 
 
@@ -17,7 +18,6 @@ class Welcome(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        logpath = "logs/log.txt"
 
         cprint(
             f"""
@@ -26,21 +26,13 @@ class Welcome(commands.Cog):
         ║============================================================║
         """
         )
-        with open(logpath, "a") as file:
-            print("\n", file=file)
-            print(f"{member} joined {member.guild.name}", file=file)
-
-        connect = sqlite3.connect(db.main)
-        cursor = connect.cursor()
-        cursor.execute(
-            db.select_table("welcome", "channel_id", "guild_id", member.guild.id)
-        )
-        chan = cursor.fetchone()
-        if chan is None:
-            return
+        log_sink.write(f"{member} joined {member.guild.name}")
+        event_log.emit("member_join", guild_id=member.guild.id, user_id=member.id)
 
-        cursor.execute(db.select_table("welcome", "text", "guild_id", member.guild.id))
-        desc = cursor.fetchone()
+        config = await db.welcome_config.get(member.guild.id)
+        if config is None or config[0] is None:
+            return
+        chan, desc = config
         hello = disnake.Embed(
             title="User joined the server",
             description=f" {member} to {member.guild}",
@@ -51,12 +43,10 @@ class Welcome(commands.Cog):
 
             hello.add_field(name="Server message", value=f"{descdef}", inline=True)
         else:
-            hello.add_field(name="Server message", value=f"{desc[0]}", inline=True)
+            hello.add_field(name="Server message", value=f"{desc}", inline=True)
 
-        channel = self.bot.get_channel(int(chan[0]))
+        channel = self.bot.get_channel(int(chan))
         await channel.send(embed=hello)
-        cursor.close()
-        connect.close()
 
     @commands.slash_command(name="welcome", description="Welcome")
     async def welcome(self, inter: disnake.ApplicationCommandInteraction):
@@ -102,30 +92,11 @@ class Welcome(commands.Cog):
         """
         try:
             if inter.author.guild_permissions.manage_channels:
-                connect = sqlite3.connect(db.main)
-                cursor = connect.cursor()
-                cursor.execute(
-                    db.select_table("welcome", "channel_id", "guild_id", inter.guild.id)
+                val = (inter.guild.id, chan.id)
+                await db.pool.execute(
+                    db.upsert_table("welcome", "guild_id", "channel_id"), val
                 )
-                res = cursor.fetchone()
-                if res is None:
-                    val = (inter.guild.id, chan.id)
-                    cursor.execute(
-                        db.insert_table("welcome", "guild_id", "channel_id"), val
-                    )
-                else:
-                    cursor.execute(
-                        db.update_table(
-                            "welcome",
-                            "channel_id",
-                            chan.id,
-                            "guild_id",
-                            inter.guild.id,
-                        )
-                    )
-                connect.commit()
-                cursor.close()
-                connect.close()
+                db.welcome_config.invalidate(inter.guild.id)
                 await inter.response.send_message(
                     f"Set the welcome channel in guild {inter.guild} to {chan.mention} ,the id of it being {chan.id} and id of guild being {inter.guild.id}"
                 )
@@ -143,24 +114,16 @@ class Welcome(commands.Cog):
         """
         try:
             if inter.author.guild_permissions.manage_channels:
-                connect = sqlite3.connect(db.main)
-                cursor = connect.cursor()
-                cursor.execute(
-                    db.select_table("welcome", "channel_id", "guild_id", inter.guild.id)
+                deleted = await db.pool.execute(
+                    db.delete_table("welcome", "guild_id"), (inter.guild.id,)
                 )
-                res = cursor.fetchone()
-                if res is None:
+                db.welcome_config.invalidate(inter.guild.id)
+                if not deleted:
                     await inter.response.send_message(
                         "Do not have a table for the welcome channel - Check Database."
                     )
                 else:
-                    cursor.execute(
-                        db.delete_table("welcome", "guild_id", inter.guild.id)
-                    )
                     await inter.response.send_message("Cleared the table")
-                connect.commit()
-                cursor.close()
-                connect.close()
             else:
                 await inter.response.send_message(
                     "You do not have enough permissions - :You require **Manage Channels**."
@@ -187,23 +150,11 @@ class Welcome(commands.Cog):
                 if content is None:
                     await inter.response.send_message("Setting default message")
                     content = "Give them a warm welcome and say hello to them"
-                connect = sqlite3.connect(db.main)
-                cursor = connect.cursor()
-                cursor.execute(
-                    db.select_table("welcome", "text", "guild_id", inter.guild.id)
+                val = (inter.guild.id, content)
+                await db.pool.execute(
+                    db.upsert_table("welcome", "guild_id", "text"), val
                 )
-                res = cursor.fetchone()
-                if res is None:
-                    val = (inter.guild.id, content)
-                    cursor.execute(db.insert_table("welcome", "guild_id", "text"), val)
-                else:
-                    val = (content, inter.guild.id)
-                    cursor.execute(
-                        "UPDATE welcome SET text = ? WHERE guild_id = ?", val
-                    )
-                connect.commit()
-                cursor.close()
-                connect.close()
+                db.welcome_config.invalidate(inter.guild.id)
                 await inter.response.send_message("Set the welcome message text")
             else:
                 await inter.response.send_message(
@@ -1,18 +1,15 @@
-"""Updates bot information on bots.servers-discord.com.
+"""Updates bot information on bot-list websites.
 
-This coroutine runs in a background task and periodically sends a request to the
-bots.servers-discord.com API to update the bot's server count. It retrieves the
-current number of guilds the bot is in and sends this information to the API
-along with the bot's client ID.
+This cog starts the bot's `BotListPoster` (see `listener.core.botlists`) in a
+background task. The poster periodically reads the number of guilds and shards
+over every cluster from the bot's stats snapshot and posts it to every bot list
+configured under `bot_lists` in the config, skipping lists whose counts have
+not changed since the last accepted post.
 """
 
 # -*- coding: utf-8 -*-
-import asyncio
-
-import requests
 from disnake.ext import commands
 from disnake.ext.commands import Bot
-from termcolor import cprint
 
 from listener.utils import Config, Logger
 
@@ -23,35 +20,12 @@ class Workers(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
         self.name = "Workers"
-        bot.loop.create_task(Workers.sdc_updater(self))
-
-    async def sdc_updater(self):
-        """Updates bot information on bots.servers-discord.com"""
-        while True:
-            await asyncio.sleep(65)
-            cprint("""║=============================║""")
-            print("║[SDC] Looping update request-║")
-            print("║Debug information║")
-            cprint(
-                f"""
-            ║=============================================║
-            ║Number of guilds:-----║Client ID:            ║
-            ║{len(self.bot.guilds)}:::::::::::::::::::║{self.bot.user.id}----║
-            ║======================║======================║
-            """
-            )
-            print("Proceeding to authorize")
-            headers = {"Authorization": CONFIG["sdc_token"]}
-            r = requests.post(
-                f"https://api.server-discord.com/v2/bots/{self.bot.user.id}/stats",
-                headers=headers,
-                data={"servers": len(self.bot.guilds), "shards": 1},
-            )
-            print(r.content)
-            print("[SDC] Authorization completed")
-            print("[SDC] Request sent")
-            cprint("""║=============================║""")
-            await asyncio.sleep(3600)
+        # Every cluster sees the same totals, so only the first one posts them.
+        if bot.cluster.cluster_id == 0:
+            bot.bot_lists.start()
+
+    def cog_unload(self) -> None:
+        self.bot.loop.create_task(self.bot.bot_lists.close())
 
 
 def setup(bot):
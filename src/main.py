@@ -5,8 +5,11 @@ This is the main entry point for the Listener Discord bot. It handles the follow
 - Configuring the bot's intents and client
 - Loading server-specific prefix settings from a JSON file
 - Registering command cogs and extensions
+- Checking the installed requirements and recording a startup timing report
 - Starting the bot and handling exceptions
-- Saving server prefix settings on shutdown
+- Running on uvloop when it is installed, unless `event_loop` in the config says otherwise
+- Running only its block of shards when started by `launcher.py` as one cluster of several
+- Saving server prefix settings and flushing every other sink on shutdown, in order
 
 The bot uses the Disnake library for Discord interactions and the CoreClient class from the listener.core.client module for additional functionality.
 """
@@ -15,38 +18,103 @@ import asyncio
 import datetime
 import json
 import os
+import signal
 import sys
+import time
+from os.path import abspath, dirname
+from pathlib import Path
+
+from listener.core.boot import profiler as boot
+
+boot.begin("imports")
 
-import aiohttp
 import disnake
 from disnake.ext import commands
 from dotenv import load_dotenv
 from termcolor import cprint
 
 import flwebhost
+from listener.core.boot import (
+    check_requirements,
+    installed_conflicts,
+    prefetch,
+    source_mismatches,
+)
 from listener.core.client import CoreClient
+from listener.core.cluster import ClusterInfo
+from listener.core.events import events as event_log
+from listener.core.locales import catalog as locale_catalog
+from listener.core.loop import describe as describe_loop
+from listener.core.loop import new_loop
+from listener.core.logsink import sink as log_sink
+from listener.core.settings import store as settings_store
 from listener.prefs import Preferences
 from listener.utils import Config, Logger, Strings, Utils
-
-import platform
-
-if platform.system() == "Linux":
-    os.system("ls -l; pip uninstall -y discord.py")
-    os.system("ls -l; pip uninstall -y wavelink")
-    os.system("ls -l; poetry remove discord.py")
-
-    os.system("pip install disnake")
-    os.system("poetry add disnake")
-    os.system("pip install -U git+https://github.com/Disnake-Extensions/jishaku")
-    os.system("pip install -U git+https://github.com/pieckenst/WaveLinkFork.git")
+from scripts import db
+
+boot.end("imports")
+
+REQUIREMENTS_PATH = Path(dirname(abspath(__file__))) / ".." / "requirements.txt"
+
+cluster = ClusterInfo.from_env()
+
+with boot.phase("preflight"):
+    missing = check_requirements(REQUIREMENTS_PATH)
+    conflicts = installed_conflicts()
+    mismatches = source_mismatches(REQUIREMENTS_PATH)
+if missing:
+    cprint(
+        f"[BOOT] Missing requirements: {', '.join(missing)}. "
+        "Install them with: pip install -r requirements.txt",
+        "yellow",
+    )
+if mismatches:
+    cprint(
+        "[BOOT] Installed from the wrong source: "
+        + ", ".join(f"{name} (expected {url})" for name, url in mismatches)
+        + ". Reinstall them with: pip install --force-reinstall "
+        + " ".join(f'"{name} @ {url}"' for name, url in mismatches),
+        "yellow",
+    )
+if conflicts:
+    cprint(
+        f"[BOOT] Conflicting packages installed: {', '.join(conflicts)}. "
+        f"Remove them with: pip uninstall {' '.join(conflicts)}",
+        "yellow",
+    )
 CONFIG = Config()
 STRINGS = Strings(CONFIG["default_locale"])
 
+startup_extensions = [
+    "listener.help",
+    "listener.testing",
+    "listener.music",
+    "listener.moderation",
+    "listener.calculator",
+    "listener.listeners",
+    "listener.admin",
+    "listener.utilities",
+    "listener.gnulinux",
+    "listener.general",
+    "listener.announce",
+    "listener.minigames",
+    "listener.other",
+    "listener.utils",
+    "listener.welcome",
+    "listener.goodbye",
+    "listener.workers",
+]
+# Registered as command stubs and only imported when first used.
+lazy_extensions = [e for e in CONFIG.get("lazy_extensions", []) if e in startup_extensions]
+eager_extensions = [e for e in startup_extensions if e not in lazy_extensions]
+
 prefixes = ["//"]
 default_prefix = "//"
 server_prefixes = {}
 loaded = False
-flwebhost.keep_alive()  # uncomment for repl.it!
+if cluster.cluster_id == 0:
+    # The web server binds a fixed port, so only one cluster may run it.
+    flwebhost.keep_alive()  # uncomment for repl.it!
 cprint(
     """ 
     _   _ ____ __   ____   __      ____ ____ ___  ___ _____ ____ ____     ____ _____ ____ 
@@ -118,86 +186,131 @@ async def main():
     nano_token = os.getenv("BOT_TOKEN")
 
     # Load server settings
-    load_server_prefixes()
+    with boot.phase("settings"):
+        load_server_prefixes()
+        if cluster.clustered:
+            # Every cluster writes and rotates its own log files.
+            log_sink.path = Path("logs") / cluster.name / "log.txt"
+            event_log.directory = Path("logs/events") / cluster.name
+            event_log.path = event_log.directory / "index.db"
+            boot.path = Path("logs") / cluster.name / "startup.json"
+        settings_store.start(CONFIG.get("settings_flush_interval"))
+        log_sink.start()
+        event_log.start()
+        if CONFIG.get("locale_hot_reload"):
+            asyncio.get_event_loop().create_task(locale_catalog.watch())
 
     # Configure client
-    intents = get_memory_config()
-    slash = True
-    client = CoreClient(command_prefix=Utils.get_prefix, intents=intents)
-    client.remove_command("help")
-
-    # Load Dependencies for DI
-
-    session = aiohttp.ClientSession()
-    modules = [Preferences(bot=client)]
-    for command_cog in modules:
-        client.add_cog(command_cog)
-        cprint(f"=====Extension - {command_cog} was loaded succesfully!=====", "green")
+    with boot.phase("client"):
+        intents = get_memory_config()
+        slash = True
+        client = CoreClient(
+            command_prefix=Utils.get_prefix, intents=intents, cluster=cluster
+        )
+        client.ipc.start(client)
+        client.stats.start()
+        client.remove_command("help")
+
+        # Load Dependencies for DI
+        modules = [Preferences(bot=client)]
+        for command_cog in modules:
+            client.add_cog(command_cog)
+            cprint(f"=====Extension - {command_cog} was loaded succesfully!=====", "green")
     if __name__ == "__main__":
+        # Import what the extensions need from a thread pool first, so the
+        # loads below only run the extensions' own code.
+        with boot.phase("prefetch"):
+            import_times = await asyncio.get_event_loop().run_in_executor(
+                None, prefetch, ["jishaku"] + eager_extensions
+            )
+        boot.begin("extensions")
         # Load command Cogs
         try:
+            started = time.perf_counter()
             client.load_extension('jishaku')
+            boot.record(
+                "jishaku",
+                imports=import_times.get("jishaku", 0.0),
+                setup=time.perf_counter() - started,
+            )
             print("    Loaded 'jishaku.py'")
         except Exception as e:
+            boot.fail("jishaku", str(e))
             print(f"    Failed to load 'jishaku': {e}")
         finally:
-            startup_extensions = [
-                "listener.help",
-                "listener.testing",
-                "listener.music",
-                "listener.moderation",
-                "listener.calculator",
-                "listener.listeners",
-                "listener.admin",
-                "listener.utilities",
-                "listener.gnulinux",
-                "listener.general",
-                "listener.announce",
-                "listener.minigames",
-                "listener.other",
-                "listener.utils",
-                "listener.welcome",
-                "listener.goodbye",
-                "listener.workers",
-            ]
-            for extension in startup_extensions:
+            for extension in eager_extensions:
                 try:
+                    started = time.perf_counter()
                     client.load_extension(extension)
+                    boot.record(
+                        extension,
+                        imports=import_times.get(extension, 0.0),
+                        setup=time.perf_counter() - started,
+                    )
                     cprint(
                         f"║=====Extension - {extension} was loaded succesfully!=====║",
                         "green",
                     )
                 except commands.errors.ExtensionFailed as e:
-                    if (
-                        isinstance(e.original, disnake.errors.HTTPException)
-                        and e.original.code == 50035
-                    ):
-                        cprint(
-                            f"║=====Warning: SyncWarning: Failed to overwrite global commands due to 400 Bad Request (error code: 50035): Invalid Form Body in {extension}=====║",
-                            "yellow",
-                        )
-                    else:
-                        exc = f"{type(e).__name__}: {e}"
-                        cprint(
-                            f"║=====Failed to load extension {extension}\n{exc}=====║",
-                            "red",
-                        )
+                    exc = f"{type(e).__name__}: {e}"
+                    boot.fail(extension, exc)
+                    cprint(
+                        f"║=====Failed to load extension {extension}\n{exc}=====║",
+                        "red",
+                    )
+        boot.end("extensions")
+        with boot.phase("lazy extensions"):
+            deferred = client.lazy.setup(lazy_extensions)
+        cprint(f"║=====Deferred until first use: {', '.join(deferred) or 'none'}=====║", "green")
+
+    # Flushed in this order once the bot stops, after running commands finished.
+    # Cogs register their own sinks (the music players go first).
+    shutdown = client.shutdown
+    shutdown.register("gateway", client.close, order=20)
+    shutdown.register("settings", settings_store.close, order=30)
+    shutdown.register("prefixes", save_server_prefixes, order=31)
+    shutdown.register("events", event_log.close, order=40)
+    shutdown.register("logs", log_sink.close, order=41)
+    shutdown.register("stats", client.stats.close, order=50)
+    shutdown.register("ipc", client.ipc.close, order=51)
+    shutdown.register("database", db.pool.close, order=60)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(
+                sig, lambda: asyncio.ensure_future(shutdown.shutdown())
+            )
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers.
+            pass
 
     # Run Bot
 
+    crashed = False
     try:
+        # Ended by `CoreClient.on_ready`, which also prints the startup report.
+        boot.begin("gateway")
         await client.start(nano_token)
 
     except Exception as e:
-        print(e)
+        crashed = True
+        print(f"[MAIN] Error: The client stopped: {type(e).__name__}: {e}")
+
+    # `/shutdown` and the signal handlers stop intake before closing the client,
+    # so a client that stopped while still accepting was not asked to.
+    if shutdown.accepting and not crashed:
+        crashed = True
+        print("[MAIN] Error: The client stopped without a shutdown being requested")
 
-    save_server_prefixes()
-    print("Saved prefixes")
-    await session.close()
-    await client.close()
+    # Runs the whole shutdown, or waits for the one `/shutdown` or a signal started.
+    await shutdown.shutdown()
     print("Session closed.")
+    # A non-zero code makes `launcher.py` restart this cluster.
+    return 1 if crashed else 0
 
 
-loop = asyncio.get_event_loop()
+# The loop has to exist before the client does, so its backend is chosen here.
+loop = new_loop(CONFIG.get("event_loop", "auto"))
+cprint(f"[LOOP] Running on {describe_loop(loop)}", "green")
 
-loop.run_until_complete(main())
+sys.exit(loop.run_until_complete(main()))
@@ -3,34 +3,256 @@ This module provides functions for interacting with a SQLite database used by th
 
 The `main` variable holds the path to the SQLite database file.
 
-The `insert_table`, `update_table`, `select_table`, and `delete_table` functions generate SQL queries for performing common database operations on tables.
+The `insert_table`, `update_table`, `select_table`, and `delete_table` functions generate parameterized SQL queries for performing common database operations on tables. Values are always passed separately as `?` parameters.
 
-The `control` function sets up the database, creating the necessary tables if they don't already exist.
+The `Database` class is the async access layer used by the cogs. Statements run on a small pool of worker threads, each keeping one persistent connection with a statement cache, so the event loop never blocks on SQLite. `pool` is the shared instance for the main database file.
+
+The `SETTINGS_SCHEMA` and `META_SCHEMA` statements define the per-guild settings table used by `listener.core.settings` and a small key/value table for bookkeeping such as one-shot data migrations.
+
+The `GuildConfigCache` class is a read-through cache of one per-guild table. It remembers guilds without a row as well, so events from unconfigured guilds cost no query. `welcome_config` and `goodbye_config` are the shared caches for the welcome and goodbye cogs, and their subcommands invalidate a guild after writing it.
+
+The `MIGRATIONS` list holds the versioned schema changes. `migrate` applies the ones newer than the database's `PRAGMA user_version`, each in its own transaction, and records the new version.
+
+The `control` function sets up the database, creating the necessary tables if they don't already exist and migrating them to the latest schema.
 """
 
+import asyncio
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Iterable, List, NoReturn, Optional, Sequence, Tuple
 
 cwd = Path.cwd()
 parent_dir = cwd.parent
 
 main = cwd / "db" / "botmaindata.db"
 
+SETTINGS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS settings("
+    "guild_id TEXT NOT NULL, field TEXT NOT NULL, value TEXT, "
+    "PRIMARY KEY (guild_id, field))"
+)
+META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)"
+
 
 def insert_table(table_name, name1, name2):
     return f"INSERT INTO {table_name}({name1}, {name2}) VALUES(?,?)"
 
 
-def update_table(table_name, name1, nm1, name2, nm2):
-    return f"UPDATE {table_name} SET {name1} = {nm1} WHERE {name2} = {nm2}"
+def update_table(table_name, name1, name2):
+    return f"UPDATE {table_name} SET {name1} = ? WHERE {name2} = ?"
+
+
+def select_table(table_name, name1, name2):
+    return f"SELECT {name1} FROM {table_name} WHERE {name2} = ?"
+
+
+def delete_table(table_name, name1):
+    return f"DELETE FROM {table_name} WHERE {name1} = ?"
+
+
+def upsert_table(table_name, key, name1):
+    return (
+        f"INSERT INTO {table_name}({key}, {name1}) VALUES(?,?) "
+        f"ON CONFLICT({key}) DO UPDATE SET {name1} = excluded.{name1}"
+    )
+
+
+class Database:
+    """Async access to a SQLite file through a pool of persistent connections."""
+
+    def __init__(
+        self, path: Path, pool_size: int = 2, cached_statements: int = 128
+    ) -> None:
+        self.path = path
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection owned by the current worker thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                str(self.path),
+                cached_statements=self.cached_statements,
+                # Only `close` touches a connection from another thread.
+                check_same_thread=False,
+            )
+            # Readers must not wait for the writer during join waves.
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    async def run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Runs `func(connection)` inside a transaction on a worker thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="db"
+            )
+
+        def _call():
+            connection = self._connection()
+            with connection:
+                return func(connection)
+
+        return await asyncio.get_event_loop().run_in_executor(self._executor, _call)
+
+    async def execute(self, sql: str, params: Sequence = ()) -> int:
+        """Executes a statement and returns the number of affected rows."""
+        return await self.run(lambda connection: connection.execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, rows: Iterable[Sequence]) -> int:
+        rows = list(rows)
+        return await self.run(
+            lambda connection: connection.executemany(sql, rows).rowcount
+        )
+
+    async def fetchone(self, sql: str, params: Sequence = ()) -> Optional[Tuple]:
+        return await self.run(lambda connection: connection.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: Sequence = ()) -> List[Tuple]:
+        return await self.run(lambda connection: connection.execute(sql, params).fetchall())
+
+    def close(self) -> NoReturn:
+        """Waits for queued statements and closes every pooled connection."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
 
 
-def select_table(table_name, name1, name2, nm2):
-    return f"SELECT {name1} FROM {table_name} WHERE {name2} = {nm2}"
+pool = Database(main)
 
 
-def delete_table(table_name, name1, nm1):
-    return f"DELETE FROM {table_name} WHERE {name1} = {nm1}"
+class GuildConfigCache:
+    """Read-through cache of a per-guild table, with negative entries."""
+
+    def __init__(self, database: Database, table: str, columns: Sequence[str]) -> None:
+        self.database = database
+        self.table = table
+        self.columns = tuple(columns)
+        self._entries: dict = {}
+        self._pending: dict = {}
+        # Bumped by every invalidation so lookups started before it are not cached.
+        self._generation = 0
+
+    async def get(self, guild_id: int) -> Optional[Tuple]:
+        """Returns the guild's row as a tuple of `columns`, or None if it has none."""
+        key = str(guild_id)
+        if key in self._entries:
+            return self._entries[key]
+
+        # Members joining together share a single lookup.
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._load(key))
+        return await asyncio.shield(pending)
+
+    async def _load(self, key: str) -> Optional[Tuple]:
+        generation = self._generation
+        try:
+            row = await self.database.fetchone(
+                select_table(self.table, ", ".join(self.columns), "guild_id"), (key,)
+            )
+        finally:
+            if self._pending.get(key) is asyncio.current_task():
+                del self._pending[key]
+        if generation == self._generation:
+            self._entries[key] = row
+        return row
+
+    def invalidate(self, guild_id: Optional[int] = None) -> NoReturn:
+        """Forgets one guild, or every guild if none is given."""
+        self._generation += 1
+        if guild_id is None:
+            self._entries.clear()
+            self._pending.clear()
+        else:
+            self._entries.pop(str(guild_id), None)
+            self._pending.pop(str(guild_id), None)
+
+
+welcome_config = GuildConfigCache(pool, "welcome", ("channel_id", "text"))
+goodbye_config = GuildConfigCache(pool, "goodbye", ("channel_id", "text"))
+
+
+# Per-guild tables and the value columns they carry besides guild_id.
+GUILD_TABLES = {
+    "welcome": ("channel_id", "text"),
+    "goodbye": ("channel_id", "text"),
+    "submit": ("channel_id",),
+    "prefixes": ("prefix",),
+    "verify": ("role_id",),
+}
+
+
+def _key_guild_tables(cursor: sqlite3.Cursor) -> NoReturn:
+    """Rebuilds the per-guild tables with a unique guild_id, merging duplicates.
+
+    For every guild the most recently written non-NULL value of each column
+    is kept, which is what the old select-then-update code would have read.
+    """
+    for table, columns in GUILD_TABLES.items():
+        column_defs = ", ".join(f"{column} TEXT" for column in columns)
+        latest = ", ".join(
+            f"(SELECT o.{column} FROM {table} AS o WHERE o.guild_id = g.guild_id "
+            f"AND o.{column} IS NOT NULL ORDER BY o.rowid DESC LIMIT 1)"
+            for column in columns
+        )
+        cursor.execute(
+            f"CREATE TABLE {table}_new(guild_id TEXT PRIMARY KEY, {column_defs})"
+        )
+        cursor.execute(
+            f"INSERT INTO {table}_new(guild_id, {', '.join(columns)}) "
+            f"SELECT g.guild_id, {latest} FROM "
+            f"(SELECT DISTINCT guild_id FROM {table} WHERE guild_id IS NOT NULL) AS g"
+        )
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+
+# (version, description, migration) - append only, never reorder.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], Any]]] = [
+    (1, "unique guild_id keys for per-guild tables", _key_guild_tables),
+]
+
+
+def migrate(base: sqlite3.Connection) -> int:
+    """Applies pending migrations and returns the resulting schema version."""
+    version = base.execute("PRAGMA user_version").fetchone()[0]
+    for target, description, migration in MIGRATIONS:
+        if target <= version:
+            continue
+        cursor = base.cursor()
+        try:
+            # Clusters start together; the write lock serializes their migrations.
+            cursor.execute("BEGIN IMMEDIATE")
+            if cursor.execute("PRAGMA user_version").fetchone()[0] >= target:
+                cursor.execute("COMMIT")
+                version = target
+                continue
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {target}")
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        version = target
+        print(f"[DB] Migrated to schema version {target}: {description}")
+    return version
 
 
 def control():
@@ -42,7 +264,8 @@ def control():
     main.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        base = sqlite3.connect(str(main))
+        # Migrations manage their own transactions.
+        base = sqlite3.connect(str(main), isolation_level=None)
         print("[DB] Connected to sqlite")
         cursor = base.cursor()
         tables = ["welcome", "goodbye"]
@@ -60,7 +283,11 @@ def control():
 
         cursor.execute("CREATE TABLE IF NOT EXISTS verify(guild_id TEXT, role_id TEXT)")
 
-        base.commit()
+        cursor.execute(SETTINGS_SCHEMA)
+        cursor.execute(META_SCHEMA)
+
+        version = migrate(base)
+        print(f"[DB] Schema version {version}")
     except sqlite3.OperationalError as e:
         print(f"[DB] Error: {e}")
         print(f"[DB] Unable to open database file: {main}")
@@ -0,0 +1,53 @@
+"""
+Local stand-in for a bot-list stats endpoint.
+
+Point a `bot_lists` entry's `url` at `http://127.0.0.1:8765/bots/{bot_id}/stats`
+to watch what `BotListPoster` sends without posting to the real sites. Every
+request is printed with its headers and body. `--fail N` answers the first N
+requests with `--status` (503 by default; with 429 a `Retry-After` header is
+sent too), which exercises the poster's backoff.
+
+    python src/tools/botlist_stub.py --port 8765 --fail 3 --status 429
+"""
+
+import argparse
+import json
+
+from aiohttp import web
+
+
+def make_app(fail: int = 0, status: int = 503, retry_after: int = 5) -> web.Application:
+    state = {"requests": 0}
+
+    async def stats(request: web.Request) -> web.Response:
+        state["requests"] += 1
+        if request.content_type == "application/json":
+            body = await request.json()
+        else:
+            body = dict(await request.post())
+        print(
+            f"[STUB] #{state['requests']} {request.method} {request.path} "
+            f"auth={request.headers.get('Authorization')!r} body={json.dumps(body)}"
+        )
+        if state["requests"] <= fail:
+            headers = {"Retry-After": str(retry_after)} if status == 429 else {}
+            return web.json_response({"error": "stubbed failure"}, status=status, headers=headers)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/bots/{bot_id}/stats", stats)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail", type=int, default=0, help="fail the first N requests")
+    parser.add_argument("--status", type=int, default=503, help="status of failed requests")
+    parser.add_argument("--retry-after", type=int, default=5)
+    args = parser.parse_args()
+    web.run_app(
+        make_app(args.fail, args.status, args.retry_after),
+        host="127.0.0.1",
+        port=args.port,
+    )
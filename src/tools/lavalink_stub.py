@@ -0,0 +1,237 @@
+"""
+Local stand-in for a Lavalink v3 node, for load testing the music cog.
+
+It speaks enough of the protocol for wavelink: the websocket accepts `play`,
+`stop`, `destroy` and ignores the other ops, and `/loadtracks` answers every
+identifier with synthetic tracks (`ytsearch:` queries get `--results` of them,
+anything else one). Every track lasts `--track-length` ms of a clock that runs
+`--speed` times faster than real time. When a track starts a `TrackStartEvent`
+is sent; when it runs out a `TrackEndEvent` with reason `FINISHED`. Stats go
+out every `--stats-interval` seconds.
+
+The stub measures the bot's event handling itself: the time from a
+`FINISHED` track end to the next `play` of the same guild, which covers
+wavelink, the cog's `on_wavelink_track_end` and the round trip.
+`GET /bench/stats` returns those latencies (`?reset=1` starts over).
+
+    python src/tools/lavalink_stub.py --port 2333 --track-length 3000 --speed 10
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import time
+from typing import Dict, List
+
+from aiohttp import WSMsgType, web
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+class FakeNode:
+    """Player clocks, events and latency measurements of the stub."""
+
+    def __init__(self, password: str, track_length: int, speed: float, results: int) -> None:
+        self.password = password
+        self.track_length = track_length
+        self.speed = speed
+        self.results = results
+        self.started = time.time()
+        self.sockets: List[web.WebSocketResponse] = []
+        self.playing: Dict[str, str] = {}
+        self.timers: Dict[str, asyncio.TimerHandle] = {}
+        self.ended: Dict[str, float] = {}
+        self.latencies: List[float] = []
+        self.counts = {"plays": 0, "starts": 0, "ends": 0, "lookups": 0}
+
+    def authorized(self, request: web.Request) -> bool:
+        return request.headers.get("Authorization") == self.password
+
+    def track(self, identifier: str, index: int = 0) -> Dict:
+        info = {
+            "identifier": f"{identifier}#{index}",
+            "isSeekable": True,
+            "author": "Stub",
+            "length": self.track_length,
+            "isStream": False,
+            "position": 0,
+            "title": f"Synthetic track {index + 1} for {identifier}",
+            "uri": f"https://stub.invalid/{index}/{identifier}",
+        }
+        encoded = base64.b64encode(json.dumps(info).encode()).decode()
+        return {"track": encoded, "info": info}
+
+    async def send(self, ws: web.WebSocketResponse, payload: Dict) -> None:
+        if not ws.closed:
+            await ws.send_str(json.dumps(payload))
+
+    def _finish(self, ws: web.WebSocketResponse, guild_id: str) -> None:
+        track = self.playing.pop(guild_id, None)
+        self.timers.pop(guild_id, None)
+        if track is None:
+            return
+        self.counts["ends"] += 1
+        self.ended[guild_id] = time.perf_counter()
+        asyncio.ensure_future(
+            self.send(
+                ws,
+                {
+                    "op": "event",
+                    "type": "TrackEndEvent",
+                    "guildId": guild_id,
+                    "track": track,
+                    "reason": "FINISHED",
+                },
+            )
+        )
+
+    async def _end(self, ws: web.WebSocketResponse, guild_id: str, reason: str) -> None:
+        timer = self.timers.pop(guild_id, None)
+        if timer is not None:
+            timer.cancel()
+        track = self.playing.pop(guild_id, None)
+        if track is not None:
+            await self.send(
+                ws,
+                {
+                    "op": "event",
+                    "type": "TrackEndEvent",
+                    "guildId": guild_id,
+                    "track": track,
+                    "reason": reason,
+                },
+            )
+
+    async def play(self, ws: web.WebSocketResponse, data: Dict) -> None:
+        guild_id = data["guildId"]
+        self.counts["plays"] += 1
+        ended = self.ended.pop(guild_id, None)
+        if ended is not None:
+            self.latencies.append(time.perf_counter() - ended)
+        if guild_id in self.playing:
+            if data.get("noReplace"):
+                return
+            await self._end(ws, guild_id, "REPLACED")
+
+        self.playing[guild_id] = data["track"]
+        self.counts["starts"] += 1
+        await self.send(
+            ws,
+            {"op": "event", "type": "TrackStartEvent", "guildId": guild_id, "track": data["track"]},
+        )
+        remaining = max(self.track_length - int(data.get("startTime") or 0), 0)
+        self.timers[guild_id] = asyncio.get_event_loop().call_later(
+            remaining / 1000 / self.speed, self._finish, ws, guild_id
+        )
+
+    async def handle(self, ws: web.WebSocketResponse, data: Dict) -> None:
+        op = data.get("op")
+        if op == "play":
+            await self.play(ws, data)
+        elif op == "stop":
+            await self._end(ws, data["guildId"], "STOPPED")
+        elif op == "destroy":
+            await self._end(ws, data["guildId"], "CLEANUP")
+            self.ended.pop(data["guildId"], None)
+
+    def stats(self) -> Dict:
+        return {
+            "op": "stats",
+            "players": len(self.playing),
+            "playingPlayers": len(self.playing),
+            "uptime": int((time.time() - self.started) * 1000),
+            "memory": {"free": 0, "used": 0, "allocated": 0, "reservable": 0},
+            "cpu": {"cores": 1, "systemLoad": 0.0, "lavalinkLoad": 0.0},
+            "frameStats": {"sent": 3000, "nulled": 0, "deficit": 0},
+        }
+
+
+def make_app(node: FakeNode, stats_interval: float) -> web.Application:
+    async def websocket(request: web.Request) -> web.StreamResponse:
+        if not node.authorized(request):
+            return web.Response(status=401)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        node.sockets.append(ws)
+        print(f"[STUB] Client connected, user {request.headers.get('User-Id')}")
+
+        async def report() -> None:
+            while not ws.closed:
+                await node.send(ws, node.stats())
+                await asyncio.sleep(stats_interval)
+
+        reporter = asyncio.ensure_future(report())
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.TEXT:
+                    await node.handle(ws, json.loads(message.data))
+        finally:
+            reporter.cancel()
+            node.sockets.remove(ws)
+            print("[STUB] Client disconnected")
+        return ws
+
+    async def loadtracks(request: web.Request) -> web.Response:
+        if not node.authorized(request):
+            return web.Response(status=401)
+        node.counts["lookups"] += 1
+        identifier = request.query.get("identifier", "")
+        if identifier.startswith("ytsearch:"):
+            tracks = [node.track(identifier, i) for i in range(node.results)]
+            load_type = "SEARCH_RESULT"
+        else:
+            tracks = [node.track(identifier)]
+            load_type = "TRACK_LOADED"
+        return web.json_response({"loadType": load_type, "playlistInfo": {}, "tracks": tracks})
+
+    async def decodetrack(request: web.Request) -> web.Response:
+        return web.json_response(json.loads(base64.b64decode(request.query["track"])))
+
+    async def bench_stats(request: web.Request) -> web.Response:
+        body = {"counts": node.counts, "latency": percentiles(node.latencies)}
+        if request.query.get("reset"):
+            node.latencies.clear()
+            node.counts = dict.fromkeys(node.counts, 0)
+        return web.json_response(body)
+
+    app = web.Application()
+    app.router.add_get("/", websocket)
+    app.router.add_get("/loadtracks", loadtracks)
+    app.router.add_get("/decodetrack", decodetrack)
+    app.router.add_get("/bench/stats", bench_stats)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for a Lavalink node")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2333)
+    parser.add_argument("--password", default="youshallnotpass")
+    parser.add_argument("--track-length", type=int, default=3000, help="ms per track")
+    parser.add_argument("--speed", type=float, default=1.0, help="clock speed factor")
+    parser.add_argument("--results", type=int, default=5, help="tracks per search")
+    parser.add_argument("--stats-interval", type=float, default=60.0)
+    args = parser.parse_args()
+
+    node = FakeNode(args.password, args.track_length, args.speed, args.results)
+    web.run_app(make_app(node, args.stats_interval), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Gateway dispatch throughput of the event loop backends.
+
+Replays a simulated gateway stream over a local TCP connection: the server
+sends `MESSAGE_CREATE` payloads the way Discord does, zlib-compressed with a
+sync flush after every event, and the client decompresses them, decodes the
+JSON and schedules a task per listener for every event, like
+`disnake.Client.dispatch` does. Every backend that is installed is measured in
+turn on a fresh loop.
+
+    python src/tools/loop_bench.py --events 50000 --listeners 3 --runs 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import struct
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from listener.core.loop import describe, new_loop  # noqa: E402
+
+HEADER = struct.Struct("!I")
+
+
+def payload(sequence: int) -> dict:
+    return {
+        "op": 0,
+        "t": "MESSAGE_CREATE",
+        "s": sequence,
+        "d": {
+            "id": str(1100000000000000000 + sequence),
+            "channel_id": "1100000000000000001",
+            "guild_id": "1100000000000000002",
+            "content": f"//play some song number {sequence}",
+            "author": {"id": "1100000000000000003", "username": "bench", "bot": False},
+            "mentions": [],
+            "attachments": [],
+            "embeds": [],
+        },
+    }
+
+
+async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, events: int) -> None:
+    compressor = zlib.compressobj()
+    for sequence in range(1, events + 1):
+        frame = compressor.compress(json.dumps(payload(sequence)).encode()) + compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+        writer.write(HEADER.pack(len(frame)) + frame)
+        if sequence % 256 == 0:
+            await writer.drain()
+    await writer.drain()
+    writer.close()
+
+
+async def consume(port: int, events: int, listeners: int) -> float:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    decompressor = zlib.decompressobj()
+    handled = 0
+    done = asyncio.get_event_loop().create_future()
+
+    async def listener(event: dict) -> None:
+        nonlocal handled
+        handled += 1
+        if handled == events * listeners:
+            done.set_result(None)
+
+    started = time.perf_counter()
+    for _ in range(events):
+        (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+        event = json.loads(decompressor.decompress(await reader.readexactly(size)))
+        for _ in range(listeners):
+            asyncio.ensure_future(listener(event["d"]))
+    await done
+    elapsed = time.perf_counter() - started
+    writer.close()
+    return elapsed
+
+
+async def run_once(events: int, listeners: int) -> float:
+    server = await asyncio.start_server(
+        lambda r, w: serve(r, w, events), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await consume(port, events, listeners)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def bench(backend: str, events: int, listeners: int, runs: int) -> None:
+    loop = new_loop(backend)
+    name = describe(loop)
+    if backend != "asyncio" and not name.startswith("uvloop"):
+        print(f"{backend:<8} not installed, skipped")
+        loop.close()
+        return
+    try:
+        times = [loop.run_until_complete(run_once(events, listeners)) for _ in range(runs)]
+    finally:
+        loop.close()
+    best = min(times)
+    print(
+        f"{name:<32} {events / best:>10.0f} events/s  "
+        f"best {best * 1000:.0f} ms, median {statistics.median(times) * 1000:.0f} ms"
+    )
+
+
+def positive(value: str) -> int:
+    # With no events or listeners `consume` would wait forever, with no runs
+    # there is nothing to report.
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=positive, default=50000)
+    parser.add_argument("--listeners", type=positive, default=3, help="listeners per event")
+    parser.add_argument("--runs", type=positive, default=3)
+    args = parser.parse_args()
+
+    for backend in ("asyncio", "uvloop"):
+        bench(backend, args.events, args.listeners, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Load test of the music cog against `tools/lavalink_stub.py`.
+
+Starts the `Music` cog on a minimal bot object, with its node pool pointed at
+the stub, then creates `--guilds` players and queues `--tracks` tracks on each
+through `Music.tracks` and `Player.add_tracks`. Queries are drawn from
+`--distinct` URLs, so the track cache is exercised as well. The stub plays
+every track on its fast clock, and each `TrackEndEvent` reaches
+`Music.on_wavelink_track_end` through the node hook the cog installs, the same
+path the bot uses, which advances the queue.
+
+Reported at the end:
+
+- `add_tracks` time per call
+- `on_wavelink_track_end` time per event, measured in the bot
+- track end to next play latency, measured by the stub (wavelink, the cog and
+  the round trip)
+- track cache and node pool counters
+
+The stub has to run with the same password, e.g.:
+
+    python src/tools/lavalink_stub.py --track-length 2000 --speed 4
+    python src/tools/music_bench.py --guilds 2000 --tracks 5 --duration 30
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import aiohttp  # noqa: E402
+
+from listener.core.loop import new_loop  # noqa: E402
+from listener.core.shutdown import ShutdownCoordinator  # noqa: E402
+import listener.music as music_module  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lavalink_stub import percentiles  # noqa: E402
+
+
+class BenchBot:
+    """The parts of `CoreClient` that the music cog and wavelink use."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.user = SimpleNamespace(id=1)
+        self.shard_count = 1
+        self.shutdown = ShutdownCoordinator()
+        self.listeners: Dict[str, List] = {}
+
+    def add_listener(self, func, name=None) -> None:
+        self.listeners.setdefault(name or func.__name__, []).append(func)
+
+    def remove_listener(self, func, name=None) -> None:
+        pass
+
+    def dispatch(self, event: str, *args) -> None:
+        for listener in self.listeners.get(f"on_{event}", []):
+            asyncio.ensure_future(listener(*args))
+
+    async def wait_until_ready(self) -> None:
+        pass
+
+    def get_guild(self, guild_id: int) -> None:
+        return None
+
+
+def summary(name: str, values: List[float]) -> str:
+    stats = percentiles(values)
+    if not stats:
+        return f"{name:<28} no samples"
+    return (
+        f"{name:<28} n={stats['count']:<7} p50 {stats['p50'] * 1000:7.2f} ms  "
+        f"p95 {stats['p95'] * 1000:7.2f} ms  p99 {stats['p99'] * 1000:7.2f} ms  "
+        f"max {stats['max'] * 1000:7.2f} ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    stub = f"http://{args.host}:{args.port}"
+    music_module.CONFIG["lavalink_nodes"] = [
+        {
+            "host": args.host,
+            "port": args.port,
+            "rest_uri": stub,
+            "password": args.password,
+            "identifier": "STUB",
+            "region": "local",
+        }
+    ]
+    bot = BenchBot(asyncio.get_event_loop())
+    music = music_module.Music(bot)
+
+    while not music.nodes.available():
+        await asyncio.sleep(0.1)
+    print(f"[BENCH] Connected to the stub at {stub}")
+
+    handled: List[float] = []
+
+    track_end = music.on_wavelink_track_end
+
+    async def timed_track_end(player, track, reason) -> None:
+        started = time.perf_counter()
+        await track_end(player, track, reason)
+        handled.append(time.perf_counter() - started)
+
+    # Only timed here; the event still arrives through `Music.on_node_event`.
+    music.on_wavelink_track_end = timed_track_end
+
+    added: List[float] = []
+
+    async def fill(guild_id: int) -> None:
+        player = music.wavelink.get_player(
+            guild_id, cls=music_module.Player, node_id=music.nodes.best().identifier
+        )
+        # Pretend the player joined a channel, so `is_playing` follows the track.
+        player.channel_id = guild_id
+        for _ in range(args.tracks):
+            tracks = await music.tracks.get(
+                f"https://bench.invalid/watch?v={random.randrange(args.distinct)}"
+            )
+            started = time.perf_counter()
+            await player.add_tracks(None, tracks)
+            added.append(time.perf_counter() - started)
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{stub}/bench/stats", params={"reset": "1"}):
+            pass
+        started = time.perf_counter()
+        for first in range(0, args.guilds, args.batch):
+            guilds = range(first + 1, min(first + args.batch, args.guilds) + 1)
+            await asyncio.gather(*(fill(guild_id) for guild_id in guilds))
+        print(
+            f"[BENCH] {args.guilds} players with {args.tracks} track(s) each queued "
+            f"in {time.perf_counter() - started:.2f}s, running for {args.duration}s"
+        )
+        await asyncio.sleep(args.duration)
+        async with session.get(f"{stub}/bench/stats") as response:
+            report = await response.json()
+
+    print(summary("add_tracks", added))
+    print(summary("on_wavelink_track_end", handled))
+    latency = report["latency"]
+    if latency:
+        print(
+            f"{'track end -> next play':<28} n={latency['count']:<7} "
+            f"p50 {latency['p50'] * 1000:7.2f} ms  p95 {latency['p95'] * 1000:7.2f} ms  "
+            f"p99 {latency['p99'] * 1000:7.2f} ms  max {latency['max'] * 1000:7.2f} ms"
+        )
+    print(f"[BENCH] Stub counters: {report['counts']}")
+    print(f"[BENCH] Track cache: {music.tracks.info()}")
+    print(f"[BENCH] Nodes: {music.nodes.info()}")
+
+    for player in list(music.wavelink.players.values()):
+        await player.node._send(op="destroy", guildId=str(player.guild_id))
+    music.cog_unload()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test of the music cog")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2333)
+    parser.add_argument("--password", default="youshallnotpass")
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--tracks", type=int, default=5, help="tracks queued per guild")
+    parser.add_argument("--distinct", type=int, default=500, help="distinct track URLs")
+    parser.add_argument("--batch", type=int, default=200, help="guilds filled at once")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--loop", default="auto", help="event loop backend")
+    args = parser.parse_args()
+
+    new_loop(args.loop).run_until_complete(run(args))
+
+
+if __name__ == "__main__":
+    main()